@@ -19,6 +19,9 @@ import pyarrow as pa
 import pyarrow.parquet as pq
 from pathlib import Path
 import logging
+from tenacity import retry, stop_after_attempt, wait_random_exponential, retry_if_exception_type
+
+from fetch_trades_ohlcv import RECOVERABLE_EXCEPTIONS, trades_to_arrays
 
 # Configure logging
 logging.basicConfig(
@@ -37,9 +40,29 @@ class MultiCoinDataCollector:
     def __init__(self, config_path: str = "multi_coin_config.json", test_mode: bool = False):
         self.config = self.load_config(config_path)
         self.test_mode = test_mode
+        
+        # Retry recoverable exchange errors with jittered exponential backoff
+        self.fetch_trades_chunk = retry(
+            reraise=True,
+            stop=stop_after_attempt(self.config["data_settings"]["max_retries"]),
+            wait=wait_random_exponential(multiplier=1, max=30),
+            retry=retry_if_exception_type(RECOVERABLE_EXCEPTIONS),
+        )(self.fetch_trades_chunk)
+        
+        # Fixed schema shared by every OHLCV chunk written by this collector
+        self.ohlcv_schema = pa.schema([
+            ('timestamp', pa.timestamp('ns')),
+            ('open', pa.float64()),
+            ('high', pa.float64()),
+            ('low', pa.float64()),
+            ('close', pa.float64()),
+            ('volume', pa.float64()),
+        ])
+        
         self.exchanges = {}
         self.setup_exchanges()
         self.setup_folders()
+        self.summary_log_path = Path(self.config["output_settings"]["base_folder"]) / "collection_summary.jsonl"
         
     def load_config(self, config_path: str) -> Dict:
         """Load configuration from JSON file"""
@@ -111,7 +134,8 @@ class MultiCoinDataCollector:
             "output_settings": {
                 "base_folder": "full_data",
                 "parquet_compression": "snappy",
-                "checkpoint_interval": 1000
+                "checkpoint_interval": 1000,
+                "dense_seconds": False
             }
         }
     
@@ -222,6 +246,8 @@ class MultiCoinDataCollector:
         try:
             trades = exchange.fetch_trades(symbol, since=since, limit=limit)
             return trades
+        except RECOVERABLE_EXCEPTIONS:
+            raise
         except Exception as e:
             logger.error(f"❌ Error fetching trades from {exchange_name} for {coin}: {e}")
             return []
@@ -231,17 +257,21 @@ class MultiCoinDataCollector:
         if not trades:
             return pd.DataFrame()
         
-        # Convert to DataFrame
-        df = pd.DataFrame(trades)
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        df.set_index('timestamp', inplace=True)
+        # Convert to a DataFrame built from pre-typed columns
+        timestamps, prices, amounts = trades_to_arrays(trades)
+        index = pd.to_datetime(timestamps, unit='ms').rename('timestamp')
+        df = pd.DataFrame({'price': prices, 'amount': amounts}, index=index, copy=False)
         
-        # Resample to 1-second OHLCV
-        ohlcv = df['price'].resample('1s').ohlc()
-        ohlcv['volume'] = df['amount'].resample('1s').sum()
-        
-        # Forward fill missing values
-        ohlcv = ohlcv.ffill()
+        if self.config["output_settings"].get("dense_seconds", False):
+            # Resample to a dense 1-second grid and forward fill empty seconds
+            ohlcv = df['price'].resample('1s').ohlc()
+            ohlcv['volume'] = df['amount'].resample('1s').sum()
+            ohlcv = ohlcv.ffill()
+        else:
+            # Aggregate only the seconds that actually contain trades
+            grouped = df.groupby(df.index.floor('1s'))
+            ohlcv = grouped['price'].ohlc()
+            ohlcv['volume'] = grouped['amount'].sum()
         
         return ohlcv
     
@@ -269,8 +299,9 @@ class MultiCoinDataCollector:
         try:
             # Save with compression
             compression = self.config["output_settings"]["parquet_compression"]
-            data.to_parquet(filepath, compression=compression, engine='pyarrow')
-            data.to_parquet(coin_filepath, compression=compression, engine='pyarrow')
+            table = pa.Table.from_pandas(data, schema=self.ohlcv_schema, preserve_index=True)
+            pq.write_table(table, filepath, compression=compression, row_group_size=500_000)
+            pq.write_table(table, coin_filepath, compression=compression, row_group_size=500_000)
             
             logger.info(f"💾 Saved {len(data)} records to {filepath}")
             
@@ -299,19 +330,12 @@ class MultiCoinDataCollector:
             # Convert to timestamp
             since = int(current_time.timestamp() * 1000)
             
-            # Fetch data with retries
-            trades = []
-            for attempt in range(max_retries):
-                try:
-                    trades = self.fetch_trades_chunk(exchange_name, coin, since, limit)
-                    if trades:
-                        break
-                    time.sleep(self.config["data_settings"]["rate_limit_delay"])
-                except Exception as e:
-                    logger.warning(f"⚠️ Attempt {attempt + 1} failed for {coin} on {exchange_name}: {e}")
-                    if attempt < max_retries - 1:
-                        time.sleep(2 ** attempt)  # Exponential backoff
-                    continue
+            # Fetch data (recoverable errors are retried by fetch_trades_chunk)
+            try:
+                trades = self.fetch_trades_chunk(exchange_name, coin, since, limit)
+            except RECOVERABLE_EXCEPTIONS as e:
+                logger.warning(f"⚠️ Giving up on chunk for {coin} on {exchange_name} after {max_retries} attempts: {e}")
+                trades = []
             
             if trades:
                 # Process to OHLCV
@@ -347,30 +371,56 @@ class MultiCoinDataCollector:
         total_pairs = len(self.exchanges) * len(self.config["coins"])
         completed_pairs = 0
         
-        collection_summary = {}
+        # Start a fresh collection log so pairs from earlier runs are not merged into this summary
+        with open(self.summary_log_path, 'w'):
+            pass
         
         for exchange_name in self.exchanges.keys():
-            collection_summary[exchange_name] = {}
-            
             for coin in self.config["coins"]:
                 try:
                     logger.info(f"📊 Processing {exchange_name} - {coin} ({completed_pairs + 1}/{total_pairs})")
                     
                     records = self.collect_data_for_pair(exchange_name, coin)
-                    collection_summary[exchange_name][coin] = records
                     
                     completed_pairs += 1
                     
                 except Exception as e:
                     logger.error(f"❌ Failed to collect data for {coin} on {exchange_name}: {e}")
-                    collection_summary[exchange_name][coin] = 0
+                    records = 0
+                
+                self.record_pair_summary(exchange_name, coin, records)
         
         # Save collection summary
-        self.save_collection_summary(collection_summary)
+        collection_summary = self.compact_summary()
         
         logger.info("🎉 Data collection completed!")
         return collection_summary
     
+    def record_pair_summary(self, exchange_name: str, coin: str, records: int):
+        """Append a completed exchange-coin pair to the JSONL collection log"""
+        record = {
+            "exchange": exchange_name,
+            "coin": coin,
+            "records": records,
+            "timestamp": datetime.now().isoformat()
+        }
+        with open(self.summary_log_path, 'a') as f:
+            f.write(json.dumps(record) + "\n")
+    
+    def compact_summary(self) -> Dict:
+        """Rebuild the legacy collection_summary.json from this run's JSONL collection log"""
+        summary = {}
+        if self.summary_log_path.exists():
+            with open(self.summary_log_path, 'r') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    summary.setdefault(record["exchange"], {})[record["coin"]] = record["records"]
+        
+        self.save_collection_summary(summary)
+        return summary
+    
     def save_collection_summary(self, summary: Dict):
         """Save collection summary to file"""
         summary_file = Path(self.config["output_settings"]["base_folder"]) / "collection_summary.json"
@@ -4,8 +4,9 @@ import sys
 import time
 import json
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 import pyarrow as pa
 import pyarrow.parquet as pq
@@ -14,6 +15,13 @@ from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_excep
 import ccxt
 
 
+TRADES_SCHEMA = pa.schema([
+    ('timestamp', pa.int64()),
+    ('price', pa.float64()),
+    ('amount', pa.float64()),
+])
+
+
 def parse_datetime_utc(dt_str: str) -> datetime:
     dt = pd.to_datetime(dt_str, utc=True)
     if dt.tzinfo is None:
@@ -50,21 +58,52 @@ def chunk_filename(checkpoint_dir: str, exchange: str, symbol: str, start_ms: in
     )
 
 
-def save_trades_chunk(checkpoint_dir: str, exchange: str, symbol: str, trades: List[Dict]) -> Optional[str]:
-    if not trades:
+def trades_to_arrays(trades: List[Dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Extract typed (timestamp int64, price float64, amount float64) arrays from trade dicts.
+
+    Trades without a timestamp are dropped; missing prices or amounts become NaN.
+    """
+    trades = [t for t in trades if t.get('timestamp') is not None]
+    count = len(trades)
+    timestamps = np.fromiter((t['timestamp'] for t in trades), dtype=np.int64, count=count)
+    prices = np.fromiter(
+        (np.nan if t.get('price') is None else float(t['price']) for t in trades),
+        dtype=np.float64,
+        count=count,
+    )
+    amounts = np.fromiter(
+        (np.nan if t.get('amount') is None else float(t['amount']) for t in trades),
+        dtype=np.float64,
+        count=count,
+    )
+    return timestamps, prices, amounts
+
+
+def open_window_writer(checkpoint_dir: str, exchange: str, symbol: str, start_ms: int, end_ms: int):
+    """Open a streaming parquet writer for a fetch window.
+
+    Pages are appended to a temporary file which is renamed into place by
+    `finalize_window_writer` once the window is complete, so partially written
+    windows are never picked up as checkpoints.
+    """
+    tmp_path = chunk_filename(checkpoint_dir, exchange, symbol, start_ms, end_ms) + '.tmp'
+    writer = pq.ParquetWriter(tmp_path, TRADES_SCHEMA, compression='zstd')
+    return writer, tmp_path
+
+
+def finalize_window_writer(
+    tmp_path: str,
+    checkpoint_dir: str,
+    exchange: str,
+    symbol: str,
+    start_ms: Optional[int],
+    end_ms: Optional[int],
+) -> Optional[str]:
+    if start_ms is None or end_ms is None:
+        os.remove(tmp_path)
         return None
-    start_ms = min(t['timestamp'] for t in trades if 'timestamp' in t and t['timestamp'] is not None)
-    end_ms = max(t['timestamp'] for t in trades if 'timestamp' in t and t['timestamp'] is not None)
     filepath = chunk_filename(checkpoint_dir, exchange, symbol, start_ms, end_ms)
-    df = pd.DataFrame(trades)
-    # Normalize expected columns
-    expected_cols = ['timestamp', 'price', 'amount']
-    for col in expected_cols:
-        if col not in df.columns:
-            df[col] = pd.NA
-    df = df[expected_cols]
-    table = pa.Table.from_pandas(df, preserve_index=False)
-    pq.write_table(table, filepath)
+    os.replace(tmp_path, filepath)
     return filepath
 
 
@@ -132,6 +171,21 @@ def assemble_trades_from_checkpoints(checkpoint_dir: str, exchange: str, symbol:
     return df_all
 
 
+def drop_duplicate_trades(df_trades: pd.DataFrame) -> pd.DataFrame:
+    """Drop repeated (timestamp, price, amount) trades with one sort and an adjacent-row compare."""
+    if df_trades.empty:
+        return df_trades
+    ts = df_trades['timestamp'].to_numpy(dtype=np.int64)
+    price = df_trades['price'].to_numpy(dtype=np.float64)
+    amount = df_trades['amount'].to_numpy(dtype=np.float64)
+    order = np.lexsort((amount, price, ts))
+    ts, price, amount = ts[order], price[order], amount[order]
+    keep = np.empty(ts.size, dtype=bool)
+    keep[0] = True
+    keep[1:] = (ts[1:] != ts[:-1]) | (price[1:] != price[:-1]) | (amount[1:] != amount[:-1])
+    return pd.DataFrame({'timestamp': ts[keep], 'price': price[keep], 'amount': amount[keep]}, copy=False)
+
+
 def resample_to_1s_ohlcv(df_trades: pd.DataFrame) -> pd.DataFrame:
     if df_trades.empty:
         return pd.DataFrame(columns=['open', 'high', 'low', 'close', 'volume'])
@@ -235,43 +289,50 @@ def main():
                 window_end = window_start
                 continue
         
-        # Fetch trades forward within the window
+        # Fetch trades forward within the window, streaming each page to disk
         since_ms = int(window_start.timestamp() * 1000)
+        window_end_ms = int(window_end.timestamp() * 1000)
         last_ts_ms = since_ms
-        window_trades = []
-        while True:
-            try:
-                trades = fetch_trades_page(exchange, symbol, since_ms=last_ts_ms, limit=limit)
-            except RECOVERABLE_EXCEPTIONS as e:
-                print(f"Recoverable error: {e}. Retrying...")
-                continue
-            except Exception as e:
-                print(f"Unrecoverable error: {e}")
-                raise
-            if not trades:
-                break
-            
-            # Normalize and add to window's trade list
-            normalized = []
-            for tr in trades:
-                normalized.append({
-                    'timestamp': tr.get('timestamp'),
-                    'price': float(tr.get('price')) if tr.get('price') is not None else None,
-                    'amount': float(tr.get('amount')) if tr.get('amount') is not None else None,
-                })
-            window_trades.extend(normalized)
-            
-            last_ts_ms = max(t['timestamp'] for t in normalized if t['timestamp'] is not None)
-            # Move forward and avoid duplicates by +1 ms
-            last_ts_ms += 1
-            if last_ts_ms >= int(window_end.timestamp() * 1000):
-                break
-            # Respect rate limiting implicitly; small sleep to be nice
-            time.sleep(exchange.rateLimit / 1000.0 if hasattr(exchange, 'rateLimit') else 0.2)
-        
-        if window_trades:
-            save_trades_chunk(checkpoint_dir, exchange_name, symbol, window_trades)
-            print(f"Saved checkpoint for window with {len(window_trades)} trades.")
+        window_count = 0
+        window_min_ts = None
+        window_max_ts = None
+        writer, tmp_path = open_window_writer(checkpoint_dir, exchange_name, symbol, since_ms, window_end_ms)
+        try:
+            while True:
+                try:
+                    trades = fetch_trades_page(exchange, symbol, since_ms=last_ts_ms, limit=limit)
+                except RECOVERABLE_EXCEPTIONS as e:
+                    print(f"Recoverable error: {e}. Retrying...")
+                    continue
+                except Exception as e:
+                    print(f"Unrecoverable error: {e}")
+                    raise
+                if not trades:
+                    break
+
+                # Write the page as a single record batch of typed columns
+                timestamps, prices, amounts = trades_to_arrays(trades)
+                if timestamps.size == 0:
+                    break
+                writer.write_batch(pa.RecordBatch.from_arrays([timestamps, prices, amounts], schema=TRADES_SCHEMA))
+                window_count += timestamps.size
+
+                page_min_ts = int(timestamps.min())
+                page_max_ts = int(timestamps.max())
+                window_min_ts = page_min_ts if window_min_ts is None else min(window_min_ts, page_min_ts)
+                window_max_ts = page_max_ts if window_max_ts is None else max(window_max_ts, page_max_ts)
+
+                # Move forward and avoid duplicates by +1 ms
+                last_ts_ms = page_max_ts + 1
+                if last_ts_ms >= window_end_ms:
+                    break
+                # Respect rate limiting implicitly; small sleep to be nice
+                time.sleep(exchange.rateLimit / 1000.0 if hasattr(exchange, 'rateLimit') else 0.2)
+        finally:
+            writer.close()
+
+        if finalize_window_writer(tmp_path, checkpoint_dir, exchange_name, symbol, window_min_ts, window_max_ts):
+            print(f"Saved checkpoint for window with {window_count} trades.")
 
         window_end = window_start
 
@@ -286,7 +347,7 @@ def main():
     all_trades = all_trades.dropna(subset=['timestamp', 'price', 'amount'])
     all_trades['timestamp'] = all_trades['timestamp'].astype('int64')
     all_trades = all_trades[(all_trades['timestamp'] >= int(start_dt.timestamp() * 1000)) & (all_trades['timestamp'] < int(end_dt.timestamp() * 1000))]
-    all_trades = all_trades.drop_duplicates()
+    all_trades = drop_duplicate_trades(all_trades)
 
     print(f"Total trades: {len(all_trades)}")
     ohlcv_1s = resample_to_1s_ohlcv(all_trades)
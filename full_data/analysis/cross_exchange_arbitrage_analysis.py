@@ -8,17 +8,26 @@ arbitrage opportunities with detailed insights, statistical analysis, and strate
 recommendations.
 """
 
+import argparse
 import os
+import sys
 import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache, reduce
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 import matplotlib.pyplot as plt
 import seaborn as sns
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -32,16 +41,142 @@ from statsmodels.stats.diagnostic import acorr_ljungbox
 from sklearn.preprocessing import StandardScaler
 from sklearn.cluster import KMeans
 
+# Optional JIT acceleration for the per-pair opportunity scan
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Optional fast JSON serialisation for the saved results
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Name of the timestamp index column written by the data collector
+TIMESTAMP_COLUMN = 'timestamp'
+
+# Columns of the per-pair statistics returned by scan_pairs
+SCAN_COUNT, SCAN_SUM, SCAN_MAX, SCAN_MIN, SCAN_VOLUME = range(5)
+
+
+def sort_dedup_timestamps(table: pa.Table) -> pa.Table:
+    """Sort an Arrow table by timestamp and keep the first row of each timestamp"""
+    table = table.sort_by([(TIMESTAMP_COLUMN, 'ascending')])
+    if table.num_rows < 2:
+        return table
+    timestamps = table[TIMESTAMP_COLUMN].combine_chunks()
+    changed = pc.not_equal(timestamps.slice(1), timestamps.slice(0, len(timestamps) - 1))
+    keep = pa.concat_arrays([pa.array([True]), changed])
+    return table.filter(keep)
+
+
+def write_json(obj, path: Path):
+    """Write obj as indented JSON, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        options = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        Path(path).write_bytes(orjson.dumps(obj, default=str, option=options))
+    else:
+        with open(path, 'w') as f:
+            json.dump(obj, f, indent=2, default=str)
+
+
+def _scan_pairs_numpy(spreads_pct: np.ndarray, volumes: np.ndarray, threshold: float) -> np.ndarray:
+    """NumPy implementation of scan_pairs, used when numba is not installed"""
+    n_exchanges = spreads_pct.shape[1]
+    stats = np.zeros((n_exchanges * n_exchanges, 5))
+    for i in range(n_exchanges):
+        for j in range(i + 1, n_exchanges):
+            # Resolve the threshold mask to row positions once and gather from it
+            spread_pct = spreads_pct[:, i, j]
+            rows = np.flatnonzero(spread_pct > threshold)
+            k = i * n_exchanges + j
+            stats[k, SCAN_COUNT] = rows.size
+            if rows.size:
+                selected = spread_pct[rows]
+                stats[k, SCAN_SUM] = selected.sum(dtype=np.float64)
+                stats[k, SCAN_MAX] = selected.max()
+                stats[k, SCAN_MIN] = selected.min()
+                stats[k, SCAN_VOLUME] = np.nansum(volumes[np.ix_(rows, (i, j))], dtype=np.float64)
+    return stats
+
+
+if NUMBA_AVAILABLE:
+    def _build_pair_scanner(n_exchanges: int):
+        """Compile a scan kernel with the exchange count baked in as a constant
+        
+        With N known at compile time the pair index arithmetic and trip counts
+        are constants, so the compiler can unroll them and keep accumulators in registers.
+        """
+        n_pairs = n_exchanges * n_exchanges
+        
+        @njit(parallel=True, cache=True, error_model='numpy')
+        def scan(spreads_pct, volumes, threshold):
+            n_rows = spreads_pct.shape[0]
+            stats = np.zeros((n_pairs, 5))
+            for k in prange(n_pairs):
+                i = k // n_exchanges
+                j = k % n_exchanges
+                if j <= i:
+                    continue
+                count = 0
+                total = 0.0
+                highest = -np.inf
+                lowest = np.inf
+                volume = 0.0
+                for t in range(n_rows):
+                    spread_pct = spreads_pct[t, i, j]
+                    if spread_pct > threshold:
+                        count += 1
+                        total += spread_pct
+                        highest = max(highest, spread_pct)
+                        lowest = min(lowest, spread_pct)
+                        if not np.isnan(volumes[t, i]):
+                            volume += volumes[t, i]
+                        if not np.isnan(volumes[t, j]):
+                            volume += volumes[t, j]
+                stats[k, SCAN_COUNT] = count
+                if count:
+                    stats[k, SCAN_SUM] = total
+                    stats[k, SCAN_MAX] = highest
+                    stats[k, SCAN_MIN] = lowest
+                    stats[k, SCAN_VOLUME] = volume
+            return stats
+        
+        return scan
+    
+    # Specialised kernels keyed by exchange count, compiled on first use
+    _pair_scanners = {}
+    
+    def scan_pairs(spreads_pct: np.ndarray, volumes: np.ndarray, threshold: float) -> np.ndarray:
+        """Fused threshold scan over a (T, N, N) percentage spread tensor.
+        
+        Returns an (N*N, 5) array indexed by i*N + j (i < j) holding the count,
+        sum, max and min of the spreads above threshold and the combined volume
+        of both exchanges at those timestamps, accumulated in float64.
+        """
+        n_exchanges = spreads_pct.shape[1]
+        if n_exchanges not in _pair_scanners:
+            _pair_scanners[n_exchanges] = _build_pair_scanner(n_exchanges)
+        return _pair_scanners[n_exchanges](spreads_pct, volumes, threshold)
+else:
+    scan_pairs = _scan_pairs_numpy
+
 class CrossExchangeArbitrageAnalyzer:
     """Enhanced analyzer for cross-exchange arbitrage opportunities with step-by-step analysis"""
     
-    def __init__(self, data_folder: str = "full_data"):
+    def __init__(self, data_folder: str = "full_data", cache_data: bool = True):
         self.data_folder = Path(data_folder)
         self.exchanges = []
         self.coins = []
         self.data_summary = {}
         self.arbitrage_opportunities = {}
         self.analysis_steps = []
+        # Loaded frames keyed by (exchange, coin); cleared after each coin when cache_data is False
+        self.cache_data = cache_data
+        self._data_cache: Dict[Tuple[str, str], pd.DataFrame] = {}
         self.setup_analysis()
     
     def setup_analysis(self):
@@ -49,6 +184,9 @@ class CrossExchangeArbitrageAnalyzer:
         print("🔍 Setting up Enhanced Cross-Exchange Arbitrage Analysis...")
         print("=" * 60)
         
+        # One timestamp for every summary and report produced by this run
+        self._run_ts = datetime.now(timezone.utc)
+        
         # Load collection summary
         summary_file = self.data_folder / "collection_summary.json"
         if summary_file.exists():
@@ -75,11 +213,13 @@ class CrossExchangeArbitrageAnalyzer:
         coins_folder = self.data_folder / "coins"
         
         if exchanges_folder.exists():
-            self.exchanges = [d.name for d in exchanges_folder.iterdir() if d.is_dir()]
+            with os.scandir(exchanges_folder) as entries:
+                self.exchanges = [entry.name for entry in entries if entry.is_dir()]
             print(f"   📈 Discovered exchanges: {', '.join(self.exchanges)}")
         
         if coins_folder.exists():
-            self.coins = [d.name for d in coins_folder.iterdir() if d.is_dir()]
+            with os.scandir(coins_folder) as entries:
+                self.coins = [entry.name for entry in entries if entry.is_dir()]
             print(f"   🪙 Discovered coins: {', '.join(self.coins)}")
         
         # Record analysis step
@@ -94,30 +234,63 @@ class CrossExchangeArbitrageAnalyzer:
         print(f"✅ Data structure discovery complete: {len(self.exchanges)} exchanges, {len(self.coins)} coins")
     
     def load_exchange_coin_data(self, exchange: str, coin: str) -> pd.DataFrame:
-        """Load data for a specific exchange-coin pair with enhanced error handling"""
+        """Load data for a specific exchange-coin pair, reusing previously loaded frames"""
+        key = (exchange, coin)
+        if key not in self._data_cache:
+            self._data_cache[key] = self._read_exchange_coin_data(exchange, coin)
+        return self._data_cache[key]
+    
+    def prefetch_coin_data(self, executor: ThreadPoolExecutor, coin: str) -> Dict[str, Future]:
+        """Submit loads of a coin's frames from every exchange to the executor"""
+        return {exchange: executor.submit(self.load_exchange_coin_data, exchange, coin)
+                for exchange in self.exchanges}
+    
+    def release_coin_data(self):
+        """Drop cached frames between coins when caching across coins is disabled"""
+        if not self.cache_data:
+            self._data_cache.clear()
+    
+    def _read_exchange_coin_data(self, exchange: str, coin: str) -> pd.DataFrame:
+        """Read data for a specific exchange-coin pair from parquet with enhanced error handling"""
         exchange_folder = self.data_folder / "exchanges" / exchange / coin
         
         if not exchange_folder.exists():
             print(f"   ⚠️ No data folder found for {exchange}/{coin}")
             return pd.DataFrame()
         
-        # Load all parquet files and combine
-        all_data = []
-        parquet_files = list(exchange_folder.glob("*.parquet"))
+        # Scan all parquet files as one dataset using Arrow's thread pool
+        parquet_files = sorted(exchange_folder.glob("*.parquet"))
         
         print(f"   📁 Loading {len(parquet_files)} data files for {exchange}/{coin}")
         
-        for parquet_file in parquet_files:
+        table = None
+        if parquet_files:
             try:
-                df = pd.read_parquet(parquet_file)
-                all_data.append(df)
+                dataset = ds.dataset([str(f) for f in parquet_files], format='parquet')
+                table = dataset.to_table(use_threads=True)
             except Exception as e:
-                print(f"   ❌ Error loading {parquet_file.name}: {e}")
-        
-        if all_data:
-            combined_data = pd.concat(all_data, ignore_index=False)
-            combined_data = combined_data.sort_index()
-            combined_data = combined_data[~combined_data.index.duplicated(keep='first')]
+                print(f"   ❌ Error scanning data files for {exchange}/{coin}, reading them one by one: {e}")
+                # Read the files separately so one unreadable file only loses its own rows
+                with ThreadPoolExecutor(max_workers=min(16, len(parquet_files))) as executor:
+                    tables = [t for t in executor.map(self._read_parquet_file, parquet_files) if t is not None]
+                if tables:
+                    table = pa.concat_tables(tables, promote_options='default')
+            if table is not None and TIMESTAMP_COLUMN in table.column_names:
+                table = sort_dedup_timestamps(table)
+        
+        if table is not None and table.num_rows > 0:
+            combined_data = table.to_pandas(split_blocks=True, self_destruct=True)
+            del table
+            # Already sorted and de-duplicated on the Arrow side; files written from pandas
+            # carry metadata that restores the timestamp as the index by itself
+            if TIMESTAMP_COLUMN in combined_data.columns:
+                combined_data = combined_data.set_index(TIMESTAMP_COLUMN)
+            elif combined_data.index.name != TIMESTAMP_COLUMN:
+                combined_data = combined_data.sort_index()
+                combined_data = combined_data[~combined_data.index.duplicated(keep='first')]
+            
+            # Prices and volumes fit float32 for spread work; halves the bytes moved downstream
+            combined_data = combined_data.astype({'close': np.float32, 'volume': np.float32}, copy=False)
             
             # Basic data quality checks
             print(f"   ✅ Loaded {len(combined_data)} records for {exchange}/{coin}")
@@ -129,121 +302,141 @@ class CrossExchangeArbitrageAnalyzer:
             print(f"   ⚠️ No data files found for {exchange}/{coin}")
             return pd.DataFrame()
     
+    def _read_parquet_file(self, parquet_file: Path) -> Optional[pa.Table]:
+        """Read one parquet file as an Arrow table, returning None if it cannot be loaded"""
+        try:
+            return pq.read_table(parquet_file)
+        except Exception as e:
+            print(f"   ❌ Error loading {parquet_file.name}: {e}")
+            return None
+    
     def calculate_data_quality_score(self, data: pd.DataFrame) -> float:
         """Calculate a data quality score (0-100)"""
         if data.empty:
             return 0.0
         
+        n = len(data)
+        
         # Check for missing values
-        missing_score = 100 - (data.isnull().sum().sum() / (len(data) * len(data.columns)) * 100)
+        missing_score = 100 - (np.count_nonzero(data.isna().to_numpy()) / data.size * 100)
         
-        # Check for price anomalies (negative prices, extreme values)
+        # Check for price anomalies (negative prices, extreme values) in one fused mask
         price_score = 100
         if 'close' in data.columns:
-            negative_prices = (data['close'] <= 0).sum()
-            extreme_prices = (data['close'] > data['close'].mean() * 10).sum()
-            price_score = 100 - ((negative_prices + extreme_prices) / len(data) * 100)
+            close = data['close'].to_numpy()
+            anomalous_prices = np.count_nonzero((close <= 0) | (close > np.nanmean(close) * 10))
+            price_score = 100 - (anomalous_prices / n * 100)
         
         # Check for volume anomalies
         volume_score = 100
         if 'volume' in data.columns:
-            negative_volume = (data['volume'] < 0).sum()
-            volume_score = 100 - (negative_volume / len(data) * 100)
+            negative_volume = np.count_nonzero(data['volume'].to_numpy() < 0)
+            volume_score = 100 - (negative_volume / n * 100)
         
         # Overall score (weighted average)
         overall_score = (missing_score * 0.4 + price_score * 0.4 + volume_score * 0.2)
         return max(0, min(100, overall_score))
     
-    def calculate_cross_exchange_spreads(self, coin: str) -> pd.DataFrame:
-        """Calculate spreads between exchanges for a specific coin"""
+    def calculate_cross_exchange_spreads(self, coin: str,
+                                         exchange_data: Optional[Dict[str, pd.DataFrame]] = None
+                                         ) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """Calculate spreads between exchanges for a specific coin
+        
+        Returns a (T, N, N) float32 tensor whose [t, i, j] entry is the percentage
+        spread of exchange i over exchange j at common timestamp t, a (T, N) float32 array
+        of the aligned volumes, and the exchange names in axis order.
+        The tensor is Fortran-ordered so each pair's series is contiguous in T.
+        Frames already loaded for the coin can be passed as exchange_data.
+        """
         print(f"📊 Calculating cross-exchange spreads for {coin}")
         
-        exchange_data = {}
-        
         # Load data from all exchanges for this coin
-        for exchange in self.exchanges:
-            data = self.load_exchange_coin_data(exchange, coin)
-            if not data.empty:
-                exchange_data[exchange] = data
+        if exchange_data is None:
+            exchange_data = {exchange: self.load_exchange_coin_data(exchange, coin) for exchange in self.exchanges}
+        exchange_data = {exchange: data for exchange, data in exchange_data.items() if not data.empty}
         
         if len(exchange_data) < 2:
             print(f"⚠️ Need at least 2 exchanges with data for {coin}")
-            return pd.DataFrame()
+            return np.empty((0, 0, 0), dtype=np.float32), np.empty((0, 0), dtype=np.float32), []
         
-        # Find common time periods
-        common_times = None
-        for exchange, data in exchange_data.items():
-            if common_times is None:
-                common_times = set(data.index)
-            else:
-                common_times = common_times.intersection(set(data.index))
+        # Find common time periods (sorted, computed inside pandas)
+        common_times = reduce(lambda left, right: left.intersection(right),
+                              (data.index for data in exchange_data.values()))
         
-        if not common_times:
+        if common_times.empty:
             print(f"⚠️ No common time periods found for {coin}")
-            return pd.DataFrame()
+            return np.empty((0, 0, 0), dtype=np.float32), np.empty((0, 0), dtype=np.float32), []
         
-        # Create comparison DataFrame
-        comparison_data = {}
+        # Stack aligned closes and volumes as (T, N) arrays
+        close_columns = []
+        volume_columns = []
         for exchange, data in exchange_data.items():
-            common_data = data.loc[list(common_times)]
-            comparison_data[f"{exchange}_close"] = common_data['close']
-            comparison_data[f"{exchange}_volume"] = common_data['volume']
-        
-        comparison_df = pd.DataFrame(comparison_data)
-        
-        # Calculate spreads between exchanges
-        exchanges_list = list(exchange_data.keys())
-        for i in range(len(exchanges_list)):
-            for j in range(i + 1, len(exchanges_list)):
-                ex1, ex2 = exchanges_list[i], exchanges_list[j]
-                spread_col = f"spread_{ex1}_vs_{ex2}"
-                spread_pct_col = f"spread_pct_{ex1}_vs_{ex2}"
-                
-                comparison_df[spread_col] = comparison_df[f"{ex1}_close"] - comparison_df[f"{ex2}_close"]
-                comparison_df[spread_pct_col] = (comparison_df[spread_col] / comparison_df[f"{ex1}_close"]) * 100
+            common_data = data.reindex(common_times)
+            close_columns.append(common_data['close'].to_numpy())
+            volume_columns.append(common_data['volume'].to_numpy())
+        
+        closes = np.stack(close_columns, axis=1, dtype=np.float32)
+        volumes = np.stack(volume_columns, axis=1, dtype=np.float32)
+        exchange_names = list(exchange_data)
+        
+        # Calculate spreads between all exchange pairs in a single broadcast
+        n_rows, n_exchanges = closes.shape
+        spreads_pct = np.empty((n_rows, n_exchanges, n_exchanges), dtype=np.float32, order='F')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.subtract(closes[:, :, None], closes[:, None, :], out=spreads_pct)
+            spreads_pct /= closes[:, :, None]
+            spreads_pct *= 100.0
         
         print(f"✅ Calculated spreads for {len(common_times)} time periods")
-        return comparison_df
+        return spreads_pct, volumes, exchange_names
     
-    def identify_arbitrage_opportunities(self, coin: str, min_spread_pct: float = 0.1) -> Dict:
-        """Identify arbitrage opportunities for a specific coin"""
+    def identify_arbitrage_opportunities(self, coin: str, min_spread_pct: float = 0.1,
+                                         spreads: Optional[Tuple[np.ndarray, np.ndarray, List[str]]] = None) -> Dict:
+        """Identify arbitrage opportunities for a specific coin
+        
+        Pass the result of calculate_cross_exchange_spreads as spreads to reuse it
+        instead of loading and broadcasting the coin's data again.
+        """
         print(f"🎯 Identifying arbitrage opportunities for {coin} (min spread: {min_spread_pct}%)")
         
-        comparison_df = self.calculate_cross_exchange_spreads(coin)
-        if comparison_df.empty:
+        if spreads is None:
+            spreads = self.calculate_cross_exchange_spreads(coin)
+        spreads_pct, volumes, exchange_names = spreads
+        if not exchange_names:
             return {}
         
+        n_rows = spreads_pct.shape[0]
         opportunities = {
             'coin': coin,
-            'total_observations': len(comparison_df),
+            'total_observations': n_rows,
             'opportunities': [],
             'summary': {}
         }
         
-        # Find spread columns
-        spread_cols = [col for col in comparison_df.columns if col.startswith('spread_pct_')]
+        # Scan every exchange pair against the threshold in one fused pass
+        pair_stats = scan_pairs(spreads_pct, volumes, float(min_spread_pct))
         
-        for spread_col in spread_cols:
-            # Extract exchange names
-            ex1, ex2 = spread_col.replace('spread_pct_', '').split('_vs_')
-            
-            # Find opportunities above threshold
-            above_threshold = comparison_df[comparison_df[spread_col] > min_spread_pct]
-            
-            if len(above_threshold) > 0:
-                opportunity = {
-                    'exchange_pair': f"{ex1}_vs_{ex2}",
-                    'buy_exchange': ex1 if above_threshold[spread_col].mean() > 0 else ex2,
-                    'sell_exchange': ex2 if above_threshold[spread_col].mean() > 0 else ex1,
-                    'opportunity_count': len(above_threshold),
-                    'opportunity_percentage': len(above_threshold) / len(comparison_df) * 100,
-                    'max_spread': above_threshold[spread_col].max(),
-                    'avg_spread': above_threshold[spread_col].mean(),
-                    'min_spread': above_threshold[spread_col].min(),
-                    'total_volume': above_threshold[f"{ex1}_volume"].sum() + above_threshold[f"{ex2}_volume"].sum()
-                }
+        n_exchanges = len(exchange_names)
+        for i in range(n_exchanges):
+            for j in range(i + 1, n_exchanges):
+                ex1, ex2 = exchange_names[i], exchange_names[j]
+                count, total, max_spread, min_spread, total_volume = pair_stats[i * n_exchanges + j]
                 
-                opportunities['opportunities'].append(opportunity)
+                if count > 0:
+                    avg_spread = total / count
+                    opportunity = {
+                        'exchange_pair': f"{ex1}_vs_{ex2}",
+                        'buy_exchange': ex1 if avg_spread > 0 else ex2,
+                        'sell_exchange': ex2 if avg_spread > 0 else ex1,
+                        'opportunity_count': int(count),
+                        'opportunity_percentage': count / n_rows * 100,
+                        'max_spread': max_spread,
+                        'avg_spread': avg_spread,
+                        'min_spread': min_spread,
+                        'total_volume': total_volume
+                    }
+                    
+                    opportunities['opportunities'].append(opportunity)
         
         # Calculate summary statistics
         if opportunities['opportunities']:
@@ -268,17 +461,28 @@ class CrossExchangeArbitrageAnalyzer:
         all_opportunities = {}
         total_opportunities = 0
         
-        for coin in self.coins:
-            print(f"\n📊 Analyzing {coin}...")
-            opportunities = self.identify_arbitrage_opportunities(coin, min_spread_pct)
-            all_opportunities[coin] = opportunities
-            
-            if opportunities and opportunities.get('summary'):
-                total_opportunities += opportunities['summary']['total_opportunities']
+        # Load the next coin's frames in the background while the current coin is analysed
+        with ThreadPoolExecutor(max_workers=max(1, len(self.exchanges))) as executor:
+            pending = self.prefetch_coin_data(executor, self.coins[0]) if self.coins else {}
+            for k, coin in enumerate(self.coins):
+                print(f"\n📊 Analyzing {coin}...")
+                futures = pending
+                if k + 1 < len(self.coins):
+                    pending = self.prefetch_coin_data(executor, self.coins[k + 1])
+                
+                exchange_data = {exchange: future.result() for exchange, future in futures.items()}
+                spreads = self.calculate_cross_exchange_spreads(coin, exchange_data)
+                opportunities = self.identify_arbitrage_opportunities(coin, min_spread_pct, spreads=spreads)
+                all_opportunities[coin] = opportunities
+                del exchange_data, spreads
+                self.release_coin_data()
+                
+                if opportunities and opportunities.get('summary'):
+                    total_opportunities += opportunities['summary']['total_opportunities']
         
         # Overall summary
         overall_summary = {
-            'analysis_date': pd.Timestamp.now().isoformat(),
+            'analysis_date': self._run_ts.isoformat(),
             'total_coins_analyzed': len(self.coins),
             'total_exchanges': len(self.exchanges),
             'total_opportunities': total_opportunities,
@@ -318,8 +522,8 @@ class CrossExchangeArbitrageAnalyzer:
                 avg_spreads.append(data['summary']['average_spread'])
                 max_spreads.append(data['summary']['maximum_spread'])
         
-        # Create subplots
-        fig, axes = plt.subplots(2, 2, figsize=(20, 15))
+        # Create subplots (constrained layout avoids a separate tight_layout pass)
+        fig, axes = plt.subplots(2, 2, figsize=(16, 12), constrained_layout=True)
         
         # Opportunities per coin
         axes[0,0].bar(coins_with_opps, opp_counts, color='skyblue', alpha=0.7)
@@ -358,14 +562,14 @@ class CrossExchangeArbitrageAnalyzer:
             axes[1,1].set_ylabel('Number of Opportunities')
             axes[1,1].tick_params(axis='x', rotation=45)
         
-        plt.tight_layout()
-        
         # Save visualization
         viz_file = self.data_folder / "analysis" / "arbitrage_opportunities_analysis.png"
-        plt.savefig(viz_file, dpi=300, bbox_inches='tight')
+        fig.savefig(viz_file, dpi=150)
         print(f"💾 Saved visualization to {viz_file}")
         
-        plt.show()
+        if sys.stdout.isatty():
+            plt.show()
+        plt.close(fig)
     
     def generate_arbitrage_report(self, opportunities: Dict) -> str:
         """Generate comprehensive arbitrage analysis report"""
@@ -373,7 +577,7 @@ class CrossExchangeArbitrageAnalyzer:
         
         report = []
         report.append("# Cross-Exchange Arbitrage Opportunity Analysis Report")
-        report.append(f"**Generated:** {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        report.append(f"**Generated:** {self._run_ts.strftime('%Y-%m-%d %H:%M:%S')} UTC")
         report.append(f"**Data Source:** {self.data_folder}")
         report.append(f"**Exchanges Analyzed:** {', '.join(self.exchanges)}")
         report.append(f"**Coins Analyzed:** {', '.join(self.coins)}")
@@ -476,22 +680,21 @@ class CrossExchangeArbitrageAnalyzer:
         quality_reports = {}
         for coin in self.coins:
             quality_reports[coin] = self.analyze_data_quality(coin)
+            self.release_coin_data()
         
-        # Step 3: Cross-Exchange Spread Analysis
+        # Steps 3-4: Cross-Exchange Spread Analysis feeding Arbitrage Opportunity Identification
         print("\n📊 Step 3: Cross-Exchange Spread Analysis...")
-        spread_analysis = {}
-        for coin in self.coins:
-            spread_analysis[coin] = self.calculate_cross_exchange_spreads(coin)
-        
-        # Step 4: Arbitrage Opportunity Identification
-        print("\n🎯 Step 4: Arbitrage Opportunity Identification...")
+        print("🎯 Step 4: Arbitrage Opportunity Identification...")
         all_opportunities = {}
         total_opportunities = 0
         
         for coin in self.coins:
             print(f"\n   📊 Analyzing {coin}...")
-            opportunities = self.identify_arbitrage_opportunities(coin, min_spread_pct)
+            spreads = self.calculate_cross_exchange_spreads(coin)
+            opportunities = self.identify_arbitrage_opportunities(coin, min_spread_pct, spreads=spreads)
+            del spreads
             all_opportunities[coin] = opportunities
+            self.release_coin_data()
             
             if opportunities and opportunities.get('summary'):
                 total_opportunities += opportunities['summary']['total_opportunities']
@@ -500,7 +703,7 @@ class CrossExchangeArbitrageAnalyzer:
         print("\n📋 Step 5: Generating Comprehensive Analysis Summary...")
         
         overall_summary = {
-            'analysis_date': pd.Timestamp.now().isoformat(),
+            'analysis_date': self._run_ts.isoformat(),
             'total_coins_analyzed': len(self.coins),
             'total_exchanges': len(self.exchanges),
             'total_opportunities': total_opportunities,
@@ -535,21 +738,18 @@ class CrossExchangeArbitrageAnalyzer:
         
         # Save opportunities data
         opportunities_file = self.data_folder / "analysis" / "enhanced_arbitrage_opportunities.json"
-        with open(opportunities_file, 'w') as f:
-            json.dump(opportunities, f, indent=2, default=str)
+        write_json(opportunities, opportunities_file)
         
         # Save analysis steps
         steps_file = self.data_folder / "analysis" / "analysis_steps.json"
-        with open(steps_file, 'w') as f:
-            json.dump(self.analysis_steps, f, indent=2, default=str)
+        write_json(self.analysis_steps, steps_file)
         
         print(f"   💾 Saved opportunities data to {opportunities_file}")
         print(f"   💾 Saved analysis steps to {steps_file}")
 
-def main():
-    """Main execution function"""
-    import argparse
-    
+@lru_cache(maxsize=None)
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Command line parser, built once per process"""
     parser = argparse.ArgumentParser(description="Enhanced Cross-Exchange Arbitrage Analyzer")
     parser.add_argument('--data-folder', type=str, default='full_data',
                        help='Path to data folder')
@@ -558,11 +758,16 @@ def main():
     parser.add_argument('--coin', type=str, help='Analyze specific coin only')
     parser.add_argument('--enhanced', action='store_true', 
                        help='Run enhanced step-by-step analysis pipeline')
-    
-    args = parser.parse_args()
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Do not keep loaded exchange data in memory across coins')
+    return parser
+
+def main():
+    """Main execution function"""
+    args = build_arg_parser().parse_args()
     
     # Initialize enhanced analyzer
-    analyzer = CrossExchangeArbitrageAnalyzer(args.data_folder)
+    analyzer = CrossExchangeArbitrageAnalyzer(args.data_folder, cache_data=not args.no_cache)
     
     if args.coin:
         # Analyze specific coin
@@ -8,34 +8,288 @@ arbitrage opportunities with detailed insights, statistical analysis, and strate
 recommendations.
 """
 
+import argparse
 import os
+import sys
 import json
+import logging
+from functools import lru_cache, partial
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 import warnings
 warnings.filterwarnings('ignore')
 
+logger = logging.getLogger(__name__)
+
+# Optional JIT acceleration for the streaming volatility statistics
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Name of the timestamp index column written by the data collector
+TIMESTAMP_COLUMN = 'timestamp'
+
+# Columns read for the data quality analysis
+QUALITY_COLUMNS = ['close', 'volume']
+
+# Rows decoded per record batch when streaming parquet files
+BATCH_SIZE = 256_000
+
+# Loaded exchange-coin frames kept per analyzer
+LOAD_CACHE_SIZE = 128
+
+# Full analysis steps are appended here (under the data folder); only step/title stay in memory
+STEPS_LOG_NAME = 'analysis_steps.jsonl'
+
+
+def padded_pct_change(values: np.ndarray, missing: np.ndarray, previous: float):
+    """pct_change of values continuing from the previous batch, forward-filling NaNs like pandas
+    
+    missing is the NaN mask of values. Returns the changes and the last padded
+    value to carry into the next batch.
+    """
+    positions = np.arange(values.size + 1)
+    positions[1:][missing] = 0
+    np.maximum.accumulate(positions, out=positions)
+    padded = np.concatenate(([previous], values))[positions]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        changes = padded[1:] / padded[:-1] - 1
+    return changes, padded[-1]
+
+
+def merge_moments(moments: Tuple[int, float, float], values: np.ndarray) -> Tuple[int, float, float]:
+    """Combine running (count, mean, M2) with the moments of values (Chan et al.)"""
+    if values.size == 0:
+        return moments
+    count, mean, m2 = moments
+    batch_mean = values.mean(dtype=np.float64)
+    batch_m2 = ((values - batch_mean) ** 2).sum(dtype=np.float64)
+    total = count + values.size
+    delta = batch_mean - mean
+    mean += delta * values.size / total
+    m2 += batch_m2 + delta ** 2 * count * values.size / total
+    return total, mean, m2
+
+
+def new_timestamp_mask(timestamps: np.ndarray, last: Optional[int]) -> Optional[np.ndarray]:
+    """Rows starting a new timestamp in a time-ordered stream, or None if the batch goes back in time
+    
+    timestamps are int64 nanoseconds and last is the final timestamp of the previous
+    batch. In an ordered stream duplicates are adjacent, so the mask keeps the first
+    row of each timestamp exactly like the sort-then-dedup loader.
+    """
+    if timestamps.size == 0:
+        return np.ones(0, dtype=bool)
+    previous = np.empty_like(timestamps)
+    previous[0] = np.iinfo(np.int64).min if last is None else last
+    previous[1:] = timestamps[:-1]
+    if (timestamps < previous).any():
+        return None
+    return timestamps != previous
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, error_model='numpy')
+    def fold_pct_change_moments(values, previous, count, mean, m2):
+        """Welford update of (count, mean, M2) over a batch's pct changes in one pass
+        
+        NaNs are forward-filled like pandas' pct_change, and changes that are NaN
+        (0/0 or no prior value) are skipped like std(skipna=True). Returns the last
+        padded value to carry into the next batch with the updated moments.
+        """
+        for i in range(values.size):
+            value = values[i]
+            if np.isnan(value):
+                value = previous
+            change = value / previous - 1.0
+            if not np.isnan(change):
+                count += 1
+                delta = change - mean
+                mean += delta / count
+                m2 += delta * (change - mean)
+            previous = value
+        return previous, count, mean, m2
+
+
+def column_bounds(metadata: pq.FileMetaData, column: str) -> Optional[Tuple[float, float]]:
+    """Min and max of a column from footer statistics, or None if any row group lacks them"""
+    if column not in metadata.schema.names:
+        return None
+    index = metadata.schema.names.index(column)
+    lows, highs = [], []
+    for i in range(metadata.num_row_groups):
+        statistics = metadata.row_group(i).column(index).statistics
+        if statistics is None or not statistics.has_min_max:
+            return None
+        lows.append(statistics.min)
+        highs.append(statistics.max)
+    return (min(lows), max(highs)) if lows else None
+
+
+def disjoint_file_order(parquet_files: List[Path], read_metadata=pq.read_metadata) -> Optional[List[Path]]:
+    """Files ordered by start time if their footer timestamp ranges do not overlap, else None"""
+    ranges = []
+    for parquet_file in parquet_files:
+        bounds = column_bounds(read_metadata(parquet_file), TIMESTAMP_COLUMN)
+        if bounds is None:
+            return None
+        ranges.append((bounds[0], bounds[1], parquet_file))
+    
+    ranges.sort(key=lambda r: r[0])
+    for (_, end, _), (start, _, _) in zip(ranges, ranges[1:]):
+        if start <= end:
+            return None
+    return [parquet_file for _, _, parquet_file in ranges]
+
+
+class QualityStats:
+    """Running data quality statistics for one exchange-coin pair, folded in batch by batch"""
+    
+    def __init__(self):
+        self.records = 0
+        # Missing-value counts in QUALITY_COLUMNS order
+        self.missing = np.zeros(len(QUALITY_COLUMNS), dtype=np.int64)
+        self.first_timestamp = None
+        self.last_timestamp = None
+        self.close_sum = 0.0
+        self.close_count = 0
+        self.close_min = np.inf
+        self.close_max = -np.inf
+        self.nonpositive_prices = 0
+        self.extreme_prices = 0
+        self.volume_sum = 0.0
+        self.volume_count = 0
+        self.negative_volumes = 0
+        # Per column: last padded value and (count, mean, M2) of its pct changes
+        self._previous = dict.fromkeys(QUALITY_COLUMNS, np.nan)
+        self._moments = {column: (0, 0.0, 0.0) for column in QUALITY_COLUMNS}
+    
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame) -> 'QualityStats':
+        """Build statistics from an already loaded, sorted and de-duplicated frame"""
+        stats = cls()
+        if not data.empty:
+            stats.update(data.index.to_numpy(), data['close'].to_numpy(), data['volume'].to_numpy())
+            if stats.needs_extreme_scan:
+                stats.count_extreme_prices(data['close'].to_numpy())
+        return stats
+    
+    def update(self, timestamps: np.ndarray, close: np.ndarray, volume: np.ndarray,
+               check_prices: bool = True, check_volumes: bool = True) -> bool:
+        """Fold one batch of a time-ordered stream, skipping repeats of the previous timestamp
+        
+        Returns False without folding anything if the batch is not in timestamp order
+        with the rows before it; the caller must then fall back to sorting the data.
+        check_prices/check_volumes can be turned off when footer statistics already
+        prove there are no non-positive prices or negative volumes in the batch.
+        """
+        timestamps = timestamps.astype('datetime64[ns]').view('int64')
+        keep = new_timestamp_mask(timestamps, self.last_timestamp)
+        if keep is None:
+            return False
+        if not keep.all():
+            timestamps, close, volume = timestamps[keep], close[keep], volume[keep]
+        if timestamps.size == 0:
+            return True
+        
+        if self.first_timestamp is None:
+            self.first_timestamp = int(timestamps[0])
+        self.last_timestamp = int(timestamps[-1])
+        self.records += timestamps.size
+        
+        # One NaN mask per column feeds the missing counts, the valid-value
+        # reductions and the forward fill of the pct changes
+        close_missing = np.isnan(close)
+        volume_missing = np.isnan(volume)
+        for position, (column, values, missing) in enumerate((('close', close, close_missing),
+                                                              ('volume', volume, volume_missing))):
+            self.missing[position] += np.count_nonzero(missing)
+            if NUMBA_AVAILABLE:
+                self._previous[column], *moments = fold_pct_change_moments(
+                    values, self._previous[column], *self._moments[column])
+                self._moments[column] = tuple(moments)
+            else:
+                changes, self._previous[column] = padded_pct_change(values, missing, self._previous[column])
+                self._moments[column] = merge_moments(self._moments[column], changes[~np.isnan(changes)])
+        
+        valid_close = close[~close_missing]
+        if valid_close.size:
+            self.close_sum += float(valid_close.sum(dtype=np.float64))
+            self.close_count += valid_close.size
+            self.close_min = min(self.close_min, float(valid_close.min()))
+            self.close_max = max(self.close_max, float(valid_close.max()))
+        if check_prices:
+            self.nonpositive_prices += int(np.count_nonzero(close <= 0))
+        
+        valid_volume = volume[~volume_missing]
+        self.volume_sum += float(valid_volume.sum(dtype=np.float64))
+        self.volume_count += valid_volume.size
+        if check_volumes:
+            self.negative_volumes += int(np.count_nonzero(volume < 0))
+        return True
+    
+    @property
+    def mean_close(self) -> float:
+        return self.close_sum / self.close_count if self.close_count else np.nan
+    
+    @property
+    def mean_volume(self) -> float:
+        return self.volume_sum / self.volume_count if self.volume_count else np.nan
+    
+    @property
+    def needs_extreme_scan(self) -> bool:
+        """Whether any price can exceed 10x the mean, requiring a second pass over close"""
+        return self.close_max > self.mean_close * 10
+    
+    def count_extreme_prices(self, close: np.ndarray):
+        """Second-pass fold counting prices above 10x the overall mean"""
+        self.extreme_prices += int(np.count_nonzero(close > self.mean_close * 10))
+    
+    def pct_change_std(self, column: str) -> float:
+        """Sample standard deviation of the column's pct changes"""
+        count, _, m2 = self._moments[column]
+        return float(np.sqrt(m2 / (count - 1))) if count > 1 else np.nan
+    
+    @property
+    def date_range(self) -> str:
+        return f"{pd.Timestamp(self.first_timestamp)} to {pd.Timestamp(self.last_timestamp)}"
+
+
 class EnhancedCrossExchangeArbitrageAnalyzer:
     """Enhanced analyzer for cross-exchange arbitrage opportunities with step-by-step analysis"""
     
-    def __init__(self, data_folder: str = "full_data"):
+    def __init__(self, data_folder: str = "full_data", setup: bool = True):
         self.data_folder = Path(data_folder)
         self.exchanges = []
         self.coins = []
         self.data_summary = {}
         self.arbitrage_opportunities = {}
         self.analysis_steps = []
-        self.setup_analysis()
+        # Step log path is set by setup_analysis; the file is opened on the first recorded step
+        self._steps_path: Optional[Path] = None
+        self._steps_fp = None
+        # Parsed parquet footers keyed by (path, mtime_ns)
+        self._meta_cache: Dict[Tuple[str, int], pq.FileMetaData] = {}
+        # Loaded frames keyed by (exchange, coin, file names and mtimes)
+        self._cached_read = lru_cache(maxsize=LOAD_CACHE_SIZE)(self._read_exchange_coin_data)
+        if setup:
+            self.setup_analysis()
     
     def setup_analysis(self):
         """Setup analysis environment and load data summary"""
         print("🔍 Setting up Enhanced Cross-Exchange Arbitrage Analysis...")
         print("=" * 60)
         
+        self._steps_path = self.data_folder / STEPS_LOG_NAME
+        
         # Load collection summary
         summary_file = self.data_folder / "collection_summary.json"
         if summary_file.exists():
@@ -46,13 +300,49 @@ class EnhancedCrossExchangeArbitrageAnalyzer:
         # Discover available exchanges and coins
         self.discover_data_structure()
         
-        # Set plotting style
+        print("✅ Analysis environment setup complete")
+        print("=" * 60)
+    
+    def _record_step(self, step: Dict):
+        """Append a step to the JSONL step log, keeping only its step number and title in memory
+        
+        Without a step log (analyzers built with setup=False) the full step is kept in memory.
+        """
+        if self._steps_path is None:
+            self.analysis_steps.append(step)
+            return
+        if self._steps_fp is None:
+            # Steps already recorded before the log was closed are kept
+            self._steps_fp = open(self._steps_path, 'a' if self.analysis_steps else 'w')
+        self._steps_fp.write(json.dumps(step, default=str) + "\n")
+        self.analysis_steps.append({'step': step['step'], 'title': step['title']})
+    
+    def load_analysis_steps(self) -> List[Dict]:
+        """Read the full recorded analysis steps back from the step log"""
+        if self._steps_path is None or not self.analysis_steps:
+            return list(self.analysis_steps)
+        if self._steps_fp is not None:
+            self._steps_fp.flush()
+        with open(self._steps_path, 'r') as f:
+            return [json.loads(line) for line in f]
+    
+    def close_step_log(self):
+        """Close the step log file; a later recorded step reopens it for appending"""
+        if self._steps_fp is not None:
+            self._steps_fp.close()
+            self._steps_fp = None
+    
+    def _ensure_plot_style(self):
+        """Import the plotting stack and apply the house style on first use"""
+        if getattr(self, '_plot_ready', False):
+            return
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        
         plt.style.use('seaborn-v0_8')
         sns.set_palette("husl")
         plt.rcParams['figure.figsize'] = (15, 10)
-        
-        print("✅ Analysis environment setup complete")
-        print("=" * 60)
+        self._plot_ready = True
     
     def discover_data_structure(self):
         """Step 1: Discover the available exchanges and coins from the data folder"""
@@ -61,16 +351,19 @@ class EnhancedCrossExchangeArbitrageAnalyzer:
         exchanges_folder = self.data_folder / "exchanges"
         coins_folder = self.data_folder / "coins"
         
+        # Names are interned so every report dict keyed by them shares one string object
         if exchanges_folder.exists():
-            self.exchanges = [d.name for d in exchanges_folder.iterdir() if d.is_dir()]
+            with os.scandir(exchanges_folder) as entries:
+                self.exchanges = sorted(sys.intern(entry.name) for entry in entries if entry.is_dir())
             print(f"   📈 Discovered exchanges: {', '.join(self.exchanges)}")
         
         if coins_folder.exists():
-            self.coins = [d.name for d in coins_folder.iterdir() if d.is_dir()]
+            with os.scandir(coins_folder) as entries:
+                self.coins = sorted(sys.intern(entry.name) for entry in entries if entry.is_dir())
             print(f"   🪙 Discovered coins: {', '.join(self.coins)}")
         
         # Record analysis step
-        self.analysis_steps.append({
+        self._record_step({
             'step': 1,
             'title': 'Data Structure Discovery',
             'description': f'Found {len(self.exchanges)} exchanges and {len(self.coins)} coins',
@@ -81,43 +374,242 @@ class EnhancedCrossExchangeArbitrageAnalyzer:
         print(f"✅ Data structure discovery complete: {len(self.exchanges)} exchanges, {len(self.coins)} coins")
     
     def load_exchange_coin_data(self, exchange: str, coin: str) -> pd.DataFrame:
-        """Load data for a specific exchange-coin pair with enhanced error handling"""
+        """Load data for a specific exchange-coin pair, reusing the frame until its files change
+        
+        Cached frames are shared between calls and must be treated as read-only.
+        """
         exchange_folder = self.data_folder / "exchanges" / exchange / coin
         
         if not exchange_folder.exists():
-            print(f"   ⚠️ No data folder found for {exchange}/{coin}")
+            logger.warning("   ⚠️ No data folder found for %s/%s", exchange, coin)
             return pd.DataFrame()
         
-        # Load all parquet files and combine
-        all_data = []
-        parquet_files = list(exchange_folder.glob("*.parquet"))
+        # Adding, removing or rewriting a shard changes the key and forces a fresh read
+        signature = tuple((f.name, f.stat().st_mtime_ns) for f in sorted(exchange_folder.glob("*.parquet")))
+        return self._cached_read(exchange, coin, signature)
+    
+    def _read_exchange_coin_data(self, exchange: str, coin: str, signature: Tuple[Tuple[str, int], ...]) -> pd.DataFrame:
+        """Read the files named in signature for an exchange-coin pair with enhanced error handling"""
+        exchange_folder = self.data_folder / "exchanges" / exchange / coin
+        
+        # Scan all parquet files as one dataset, reading only the columns the analysis uses
+        parquet_files = [exchange_folder / name for name, _ in signature]
         
-        print(f"   📁 Loading {len(parquet_files)} data files for {exchange}/{coin}")
+        logger.debug("   📁 Loading %d data files for %s/%s", len(parquet_files), exchange, coin)
         
-        for parquet_file in parquet_files:
+        table = None
+        disjoint_files = None
+        if parquet_files:
             try:
-                df = pd.read_parquet(parquet_file)
-                all_data.append(df)
+                # Shards covering disjoint time ranges can be concatenated in order without a sort
+                disjoint_files = self.disjoint_file_order(parquet_files)
+                dataset = ds.dataset([str(f) for f in disjoint_files or parquet_files], format='parquet')
+                columns = [c for c in (TIMESTAMP_COLUMN, *QUALITY_COLUMNS) if c in dataset.schema.names]
+                table = dataset.to_table(columns=columns, use_threads=True)
             except Exception as e:
-                print(f"   ❌ Error loading {parquet_file.name}: {e}")
+                logger.error("   ❌ Error scanning data files for %s/%s, reading them one by one: %s",
+                             exchange, coin, e)
+                # Read the files separately so one unreadable file only loses its own rows
+                disjoint_files = None
+                with ThreadPoolExecutor(max_workers=min(16, len(parquet_files))) as executor:
+                    tables = [t for t in executor.map(self._read_parquet_file, parquet_files) if t is not None]
+                if tables:
+                    table = pa.concat_tables(tables, promote_options='default')
         
-        if all_data:
-            combined_data = pd.concat(all_data, ignore_index=False)
-            combined_data = combined_data.sort_index()
-            combined_data = combined_data[~combined_data.index.duplicated(keep='first')]
+        if table is not None and table.num_rows > 0:
+            combined_data = table.to_pandas(self_destruct=True)
+            del table
+            if TIMESTAMP_COLUMN in combined_data.columns:
+                combined_data = combined_data.set_index(TIMESTAMP_COLUMN)
             
-            # Basic data quality checks
-            print(f"   ✅ Loaded {len(combined_data)} records for {exchange}/{coin}")
-            print(f"   📅 Date range: {combined_data.index.min()} to {combined_data.index.max()}")
-            print(f"   💰 Price range: ${combined_data['close'].min():.2f} - ${combined_data['close'].max():.2f}")
+            # Fast path: ordered disjoint shards whose index is already strictly increasing
+            index_values = combined_data.index.to_numpy()
+            if not (disjoint_files and np.all(index_values[1:] > index_values[:-1])):
+                # After sorting duplicates are adjacent, so one compare keeps the first of each
+                combined_data = combined_data.sort_index()
+                index_values = combined_data.index.to_numpy()
+                keep = np.empty(index_values.size, dtype=bool)
+                keep[:1] = True
+                np.not_equal(index_values[1:], index_values[:-1], out=keep[1:])
+                combined_data = combined_data[keep]
+            
+            # float32 keeps plenty of precision for quality statistics and halves memory traffic
+            combined_data = combined_data.astype({column: np.float32 for column in QUALITY_COLUMNS
+                                                  if column in combined_data.columns}, copy=False)
+            
+            # Basic data quality checks; the index is sorted, so its ends are the date range
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("   ✅ Loaded %d records for %s/%s (%s to %s, $%.2f - $%.2f)",
+                            len(combined_data), exchange, coin, combined_data.index[0], combined_data.index[-1],
+                            combined_data['close'].min(), combined_data['close'].max())
             
             return combined_data
         else:
-            print(f"   ⚠️ No data files found for {exchange}/{coin}")
+            logger.warning("   ⚠️ No data files found for %s/%s", exchange, coin)
             return pd.DataFrame()
     
-    def analyze_data_quality(self, coin: str) -> Dict:
-        """Step 2: Analyze data quality and completeness for each coin"""
+    def _read_parquet_file(self, parquet_file: Path) -> Optional[pa.Table]:
+        """Read the analysed columns of one parquet file, returning None if it cannot be loaded"""
+        try:
+            parquet = pq.ParquetFile(parquet_file)
+            columns = [c for c in (TIMESTAMP_COLUMN, *QUALITY_COLUMNS) if c in parquet.schema_arrow.names]
+            return parquet.read(columns=columns)
+        except Exception as e:
+            logger.error("   ❌ Error loading %s: %s", parquet_file.name, e)
+            return None
+    
+    def read_file_metadata(self, path: Path) -> pq.FileMetaData:
+        """Parquet footer for path, parsed once per file modification time"""
+        key = (str(path), path.stat().st_mtime_ns)
+        metadata = self._meta_cache.get(key)
+        if metadata is None:
+            metadata = self._meta_cache[key] = pq.read_metadata(path)
+        return metadata
+    
+    def disjoint_file_order(self, parquet_files: List[Path]) -> Optional[List[Path]]:
+        """Files ordered by start time if their footer timestamp ranges do not overlap, else None"""
+        return disjoint_file_order(parquet_files, self.read_file_metadata)
+    
+    def scan_exchange_coin_stats(self, exchange: str, coin: str) -> QualityStats:
+        """Stream an exchange-coin pair's parquet files batch by batch into QualityStats
+        
+        Only one record batch is held in memory at a time. Files are folded in footer
+        start-time order, which needs disjoint shard time ranges and rows sorted within
+        each shard; otherwise the pair is loaded, sorted and de-duplicated instead.
+        """
+        exchange_folder = self.data_folder / "exchanges" / exchange / coin
+        
+        if not exchange_folder.exists():
+            logger.warning("   ⚠️ No data folder found for %s/%s", exchange, coin)
+            return QualityStats()
+        
+        parquet_files = sorted(exchange_folder.glob("*.parquet"))
+        columns = [TIMESTAMP_COLUMN, *QUALITY_COLUMNS]
+        
+        try:
+            ordered_files = self.disjoint_file_order(parquet_files)
+        except Exception:
+            ordered_files = None
+        if ordered_files is None:
+            # Overlapping (or unreadable) footers: only a sort can order the rows
+            logger.debug("   📁 Shard time ranges overlap for %s/%s, loading the data", exchange, coin)
+            return QualityStats.from_frame(self.load_exchange_coin_data(exchange, coin))
+        
+        logger.debug("   📁 Scanning %d data files for %s/%s", len(ordered_files), exchange, coin)
+        
+        stats = QualityStats()
+        for parquet_file in ordered_files:
+            try:
+                metadata = self.read_file_metadata(parquet_file)
+                # Skip anomaly checks the footer statistics already rule out
+                close_bounds = column_bounds(metadata, 'close')
+                volume_bounds = column_bounds(metadata, 'volume')
+                check_prices = close_bounds is None or close_bounds[0] <= 0
+                check_volumes = volume_bounds is None or volume_bounds[0] < 0
+                
+                parquet = pq.ParquetFile(parquet_file, metadata=metadata)
+                for batch in parquet.iter_batches(batch_size=BATCH_SIZE, columns=columns):
+                    if not stats.update(*(batch.column(c).to_numpy(zero_copy_only=False) for c in columns),
+                                        check_prices=check_prices, check_volumes=check_volumes):
+                        logger.debug("   📁 %s is not sorted by time, loading %s/%s",
+                                     parquet_file.name, exchange, coin)
+                        return QualityStats.from_frame(self.load_exchange_coin_data(exchange, coin))
+            except Exception as e:
+                logger.error("   ❌ Error loading %s: %s", parquet_file.name, e)
+        
+        # Prices above 10x the mean are only possible when the max exceeds it;
+        # the second pass skips the same repeated timestamps as the first
+        if stats.needs_extreme_scan:
+            last_timestamp = None
+            for parquet_file in ordered_files:
+                try:
+                    parquet = pq.ParquetFile(parquet_file, metadata=self.read_file_metadata(parquet_file))
+                    for batch in parquet.iter_batches(batch_size=BATCH_SIZE, columns=[TIMESTAMP_COLUMN, 'close']):
+                        timestamps = (batch.column(TIMESTAMP_COLUMN).to_numpy(zero_copy_only=False)
+                                      .astype('datetime64[ns]').view('int64'))
+                        if timestamps.size == 0:
+                            continue
+                        keep = new_timestamp_mask(timestamps, last_timestamp)
+                        last_timestamp = int(timestamps[-1])
+                        close = batch.column('close').to_numpy(zero_copy_only=False)
+                        stats.count_extreme_prices(close if keep is None else close[keep])
+                except Exception as e:
+                    logger.error("   ❌ Error scanning %s for extreme prices: %s", parquet_file.name, e)
+        
+        if stats.records:
+            logger.info("   ✅ Scanned %d records for %s/%s (%s, $%.2f - $%.2f)",
+                        stats.records, exchange, coin, stats.date_range, stats.close_min, stats.close_max)
+        else:
+            logger.warning("   ⚠️ No data files found for %s/%s", exchange, coin)
+        
+        return stats
+    
+    def footer_quality_stats(self, exchange: str, coin: str) -> Optional[QualityStats]:
+        """Record, null and range statistics from parquet footers alone, without reading data
+        
+        Returns None unless the footers settle every count in the quality score:
+        shard time ranges must be disjoint (so row counts contain no duplicate
+        timestamps) and the min/max statistics must rule out non-positive prices,
+        prices above 10x the mean and negative volumes.
+        """
+        exchange_folder = self.data_folder / "exchanges" / exchange / coin
+        parquet_files = sorted(exchange_folder.glob("*.parquet")) if exchange_folder.exists() else []
+        if not parquet_files:
+            return None
+        
+        stats = QualityStats()
+        volume_min = np.inf
+        try:
+            if self.disjoint_file_order(parquet_files) is None:
+                return None
+            for parquet_file in parquet_files:
+                metadata = self.read_file_metadata(parquet_file)
+                bounds = {column: column_bounds(metadata, column) for column in (TIMESTAMP_COLUMN, *QUALITY_COLUMNS)}
+                if any(b is None for b in bounds.values()):
+                    return None
+                
+                stats.records += metadata.num_rows
+                for position, column in enumerate(QUALITY_COLUMNS):
+                    index = metadata.schema.names.index(column)
+                    stats.missing[position] += sum(metadata.row_group(i).column(index).statistics.null_count
+                                                 for i in range(metadata.num_row_groups))
+                first, last = (pd.Timestamp(t).value for t in bounds[TIMESTAMP_COLUMN])
+                stats.first_timestamp = first if stats.first_timestamp is None else min(stats.first_timestamp, first)
+                stats.last_timestamp = last if stats.last_timestamp is None else max(stats.last_timestamp, last)
+                stats.close_min = min(stats.close_min, bounds['close'][0])
+                stats.close_max = max(stats.close_max, bounds['close'][1])
+                volume_min = min(volume_min, bounds['volume'][0])
+        except Exception:
+            return None
+        
+        # The mean is at least the minimum, so max <= 10 * min rules out extreme prices
+        if stats.close_min <= 0 or stats.close_max > stats.close_min * 10 or volume_min < 0:
+            return None
+        return stats
+    
+    def load_quality_stats(self, exchange: str, coin: str, materialize: bool = False,
+                           compute_volatility: bool = True) -> QualityStats:
+        """Quality statistics for one exchange-coin pair, streamed or from the loaded frame
+        
+        Without volatility the parquet footers are tried first and the data is
+        only read when they cannot answer.
+        """
+        if not compute_volatility:
+            stats = self.footer_quality_stats(exchange, coin)
+            if stats is not None:
+                return stats
+        if materialize:
+            return QualityStats.from_frame(self.load_exchange_coin_data(exchange, coin))
+        return self.scan_exchange_coin_stats(exchange, coin)
+    
+    def analyze_data_quality(self, coin: str, materialize: bool = False, compute_volatility: bool = True) -> Dict:
+        """Step 2: Analyze data quality and completeness for each coin
+        
+        Statistics are streamed from the parquet files by default; pass
+        materialize=True to load each exchange's full frame instead. With
+        compute_volatility=False the volatility and volume statistics are left
+        out, which usually lets the report come from parquet footers alone.
+        """
         print(f"\n📊 Step 2: Data Quality Analysis for {coin}...")
         
         quality_report = {
@@ -128,39 +620,52 @@ class EnhancedCrossExchangeArbitrageAnalyzer:
         }
         
         total_records = 0
-        total_missing = 0
         exchange_coverage = {}
+        # Missing-value counts per exchange (rows) and quality column
+        missing = np.zeros((len(self.exchanges), len(QUALITY_COLUMNS)), dtype=np.int64)
+        
+        # Read every exchange's files concurrently; parquet decoding releases the GIL
+        with ThreadPoolExecutor(max_workers=max(1, min(16, len(self.exchanges)))) as executor:
+            futures = {executor.submit(self.load_quality_stats, exchange, coin, materialize, compute_volatility): exchange
+                       for exchange in self.exchanges}
+            exchange_stats = {futures[future]: future.result() for future in as_completed(futures)}
         
-        for exchange in self.exchanges:
-            data = self.load_exchange_coin_data(exchange, coin)
-            if not data.empty:
+        for exchange_idx, exchange in enumerate(self.exchanges):
+            stats = exchange_stats[exchange]
+            if stats.records:
                 # Data quality metrics
-                missing_data = data.isnull().sum()
-                price_volatility = data['close'].pct_change().std() * 100
-                volume_stats = {
-                    'total_volume': data['volume'].sum(),
-                    'avg_volume': data['volume'].mean(),
-                    'volume_volatility': data['volume'].pct_change().std() * 100
-                }
+                missing[exchange_idx] = stats.missing
+                price_volatility = None
+                volume_stats = None
+                if compute_volatility:
+                    price_volatility = stats.pct_change_std('close') * 100
+                    volume_stats = {
+                        'total_volume': stats.volume_sum,
+                        'avg_volume': stats.mean_volume,
+                        'volume_volatility': stats.pct_change_std('volume') * 100
+                    }
                 
                 exchange_coverage[exchange] = {
-                    'records': len(data),
-                    'date_range': f"{data.index.min()} to {data.index.max()}",
-                    'missing_data': missing_data.to_dict(),
+                    'records': stats.records,
+                    'date_range': stats.date_range,
+                    'missing_data': dict(zip(QUALITY_COLUMNS, missing[exchange_idx].tolist())),
                     'price_volatility': price_volatility,
                     'volume_stats': volume_stats,
-                    'data_quality_score': self.calculate_data_quality_score(data)
+                    'data_quality_score': self.calculate_data_quality_score(stats)
                 }
                 
-                total_records += len(data)
-                total_missing += missing_data.sum().sum()
+                total_records += stats.records
                 
-                print(f"   📈 {exchange}: {len(data)} records, {price_volatility:.2f}% price volatility")
+                if compute_volatility:
+                    print(f"   📈 {exchange}: {stats.records} records, {price_volatility:.2f}% price volatility")
+                else:
+                    print(f"   📈 {exchange}: {stats.records} records")
             else:
                 exchange_coverage[exchange] = None
                 print(f"   ❌ {exchange}: No data available")
         
         # Overall quality assessment
+        total_missing = int(missing.sum())
         quality_report['exchanges'] = exchange_coverage
         quality_report['overall_quality'] = {
             'total_records': total_records,
@@ -182,7 +687,7 @@ class EnhancedCrossExchangeArbitrageAnalyzer:
         print(f"   🎯 Data completeness: {quality_report['overall_quality']['data_completeness']:.1f}%")
         
         # Record analysis step
-        self.analysis_steps.append({
+        self._record_step({
             'step': 2,
             'title': 'Data Quality Analysis',
             'description': f'Analyzed data quality for {coin}',
@@ -191,33 +696,47 @@ class EnhancedCrossExchangeArbitrageAnalyzer:
         
         return quality_report
     
-    def calculate_data_quality_score(self, data: pd.DataFrame) -> float:
-        """Calculate a data quality score (0-100)"""
-        if data.empty:
+    def calculate_data_quality_score(self, stats) -> float:
+        """Calculate a data quality score (0-100) from QualityStats or a loaded DataFrame"""
+        if isinstance(stats, pd.DataFrame):
+            if not stats.empty and all(column in stats.columns for column in QUALITY_COLUMNS):
+                # Clean frames score 100 without building the full stats
+                values = stats[QUALITY_COLUMNS].to_numpy(copy=False)
+                close = values[:, 0]
+                if (not np.isnan(values).any() and (close > 0).all() and (values[:, 1] >= 0).all()
+                        and close.max() <= close.mean(dtype=np.float64) * 10):
+                    return 100.0
+            stats = QualityStats.from_frame(stats)
+        if not stats.records:
             return 0.0
         
+        n = stats.records
+        
+        # Nothing missing and no anomalies: every component scores 100
+        if not stats.missing.any() and not (stats.nonpositive_prices or stats.extreme_prices
+                                            or stats.negative_volumes):
+            return 100.0
+        
         # Check for missing values
-        missing_score = 100 - (data.isnull().sum().sum() / (len(data) * len(data.columns)) * 100)
+        missing_score = 100 - (stats.missing.sum() / (n * stats.missing.size) * 100)
         
         # Check for price anomalies (negative prices, extreme values)
-        price_score = 100
-        if 'close' in data.columns:
-            negative_prices = (data['close'] <= 0).sum()
-            extreme_prices = (data['close'] > data['close'].mean() * 10).sum()
-            price_score = 100 - ((negative_prices + extreme_prices) / len(data) * 100)
+        price_score = 100 - ((stats.nonpositive_prices + stats.extreme_prices) / n * 100)
         
         # Check for volume anomalies
-        volume_score = 100
-        if 'volume' in data.columns:
-            negative_volume = (data['volume'] < 0).sum()
-            volume_score = 100 - (negative_volume / len(data) * 100)
+        volume_score = 100 - (stats.negative_volumes / n * 100)
         
         # Overall score (weighted average)
         overall_score = (missing_score * 0.4 + price_score * 0.4 + volume_score * 0.2)
         return max(0, min(100, overall_score))
     
-    def run_complete_enhanced_analysis(self, min_spread_pct: float = 0.1):
-        """Run complete enhanced arbitrage analysis pipeline with step-by-step insights"""
+    def run_complete_enhanced_analysis(self, min_spread_pct: float = 0.1, compute_volatility: bool = True,
+                                       workers: int = 1, load_steps: bool = False):
+        """Run complete enhanced arbitrage analysis pipeline with step-by-step insights
+        
+        With workers > 1 the per-coin quality analysis runs in that many processes.
+        With load_steps the full analysis steps are read back from the step log.
+        """
         print("🚀 Starting Enhanced Cross-Exchange Arbitrage Analysis Pipeline...")
         print("=" * 80)
         
@@ -227,34 +746,63 @@ class EnhancedCrossExchangeArbitrageAnalyzer:
         # Step 2: Data Quality Analysis for all coins
         print("\n📊 Step 2: Comprehensive Data Quality Analysis...")
         quality_reports = {}
-        for coin in self.coins:
-            quality_reports[coin] = self.analyze_data_quality(coin)
+        try:
+            if workers > 1 and len(self.coins) > 1:
+                task = partial(_quality_task, str(self.data_folder), self.exchanges,
+                               compute_volatility=compute_volatility)
+                with ProcessPoolExecutor(max_workers=min(workers, len(self.coins))) as pool:
+                    for coin, (quality_report, steps) in zip(self.coins, pool.map(task, self.coins)):
+                        quality_reports[coin] = quality_report
+                        for step in steps:
+                            self._record_step(step)
+            else:
+                for coin in self.coins:
+                    quality_reports[coin] = self.analyze_data_quality(coin, compute_volatility=compute_volatility)
+        finally:
+            self.close_step_log()
         
         print("\n🎉 Enhanced Analysis Pipeline Complete!")
         print("=" * 80)
         
         return {
             'quality_reports': quality_reports,
-            'analysis_steps': self.analysis_steps,
+            'analysis_steps': self.load_analysis_steps() if load_steps else self.analysis_steps,
+            'analysis_steps_file': str(self._steps_path) if self._steps_path else None,
             'exchanges': self.exchanges,
             'coins': self.coins
         }
 
-def main():
-    """Main execution function"""
-    import argparse
-    
+def _quality_task(data_folder: str, exchanges: List[str], coin: str, compute_volatility: bool = True):
+    """Run one coin's quality analysis in a worker process, returning the report and its steps"""
+    analyzer = EnhancedCrossExchangeArbitrageAnalyzer(data_folder, setup=False)
+    analyzer.exchanges = exchanges
+    quality_report = analyzer.analyze_data_quality(coin, compute_volatility=compute_volatility)
+    return quality_report, analyzer.analysis_steps
+
+@lru_cache(maxsize=None)
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Command line parser, built once per process"""
     parser = argparse.ArgumentParser(description="Enhanced Cross-Exchange Arbitrage Analyzer")
     parser.add_argument('--data-folder', type=str, default='full_data',
                        help='Path to data folder')
+    parser.add_argument('--no-volatility', action='store_true',
+                       help='Skip volatility and volume statistics, reading parquet footers only where possible')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Processes for the per-coin quality analysis (0 = one per CPU)')
+    return parser
+
+def main():
+    """Main execution function"""
+    args = build_arg_parser().parse_args()
     
-    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     
     # Initialize enhanced analyzer
     analyzer = EnhancedCrossExchangeArbitrageAnalyzer(args.data_folder)
     
     # Run complete enhanced analysis
-    results = analyzer.run_complete_enhanced_analysis()
+    results = analyzer.run_complete_enhanced_analysis(compute_volatility=not args.no_volatility,
+                                                      workers=args.workers or os.cpu_count())
     
     print("\n📋 Analysis Results Summary:")
     print(f"   📊 Exchanges analyzed: {len(results['exchanges'])}")
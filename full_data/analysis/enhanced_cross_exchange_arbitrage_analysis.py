@@ -8,16 +8,25 @@ arbitrage opportunities with detailed insights, statistical analysis, and strate
 recommendations.
 """
 
+import argparse
+import io
 import os
+import sys
+import heapq
 import json
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
 import pandas as pd
 import numpy as np
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 import matplotlib.pyplot as plt
 import seaborn as sns
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -29,19 +38,253 @@ from scipy.stats import shapiro, jarque_bera, normaltest
 import statsmodels.api as sm
 from statsmodels.stats.diagnostic import acorr_ljungbox
 from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
+from sklearn.cluster import MiniBatchKMeans
+
+# Streaming statistics helpers shared with the quality analyzer in this folder
+from enhanced_arbitrage_analyzer import disjoint_file_order, merge_moments, new_timestamp_mask, padded_pct_change
+
+# Optional static image export for the Plotly charts
+try:
+    import kaleido
+    KALEIDO_AVAILABLE = True
+except ImportError:
+    KALEIDO_AVAILABLE = False
+
+# Optional JIT acceleration for the data quality checks
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Optional fast JSON serialisation for the saved results
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    # NumPy scalars are encoded natively, so default=str is only reached for types like Timestamp
+    ORJSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Name of the timestamp index column written by the data collector
+TIMESTAMP_COLUMN = 'timestamp'
+
+# Columns the analysis reads; everything else in the parquet files is skipped at decode time
+LOAD_COLUMNS = ['close', 'volume', 'high', 'low']
+
+# Rows per tile when computing pair spreads, so each tile's spreads are reduced while still in L2 cache
+SPREAD_BLOCK_ROWS = 65_536
+
+# Rows decoded per record batch when streaming parquet files
+STREAM_BATCH_SIZE = 262_144
+
+# Report blocks per exchange pair and per top opportunity, each filled from an opportunity dict in one format call
+PAIR_REPORT_TEMPLATE = ("#### {exchange_pair}\n"
+                        "- **Buy Exchange:** {buy_exchange}\n"
+                        "- **Sell Exchange:** {sell_exchange}\n"
+                        "- **Opportunities:** {opportunity_count:,} ({opportunity_percentage:.2f}%)\n"
+                        "- **Spread Range:** {min_spread:.4f}% - {max_spread:.4f}%\n"
+                        "- **Average Spread:** {avg_spread:.4f}%\n"
+                        "- **Risk Score:** {risk_score:.1f}/100\n"
+                        "- **Profitability Score:** {profitability_score:.1f}/100\n"
+                        "- **Total Volume:** {total_volume:,.2f}\n\n")
+TOP_REPORT_TEMPLATE = ("{0}. **{1[coin]} - {1[exchange_pair]}**\n"
+                       "   - Composite Score: {1[composite_score]:.1f}\n"
+                       "   - Profitability: {1[profitability_score]:.1f}/100\n"
+                       "   - Risk: {1[risk_score]:.1f}/100\n"
+                       "   - Opportunity Rate: {1[opportunity_percentage]:.2f}%\n"
+                       "   - Average Spread: {1[avg_spread]:.4f}%\n\n")
+# Bound once, so rendering a block is a single call with no attribute lookup on the template
+format_pair_report = PAIR_REPORT_TEMPLATE.format_map
+format_top_report = TOP_REPORT_TEMPLATE.format
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, error_model='numpy')
+    def count_price_anomalies(close):
+        """Count non-positive prices and prices above ten times the mean price
+        
+        NaNs are skipped for the mean and never count as anomalies, like the pandas checks.
+        """
+        total = 0.0
+        count = 0
+        nonpositive = 0
+        for i in range(close.size):
+            value = close[i]
+            if not np.isnan(value):
+                total += value
+                count += 1
+                if value <= 0:
+                    nonpositive += 1
+        extreme = 0
+        if count:
+            threshold = total / count * 10
+            for i in range(close.size):
+                if close[i] > threshold:
+                    extreme += 1
+        return nonpositive, extreme
+else:
+    def count_price_anomalies(close):
+        """Count non-positive prices and prices above ten times the mean price"""
+        nonpositive = np.count_nonzero(close <= 0)
+        extreme = np.count_nonzero(close > np.nanmean(close) * 10)
+        return nonpositive, extreme
+
+
+def quality_score(records: int, n_columns: int, missing: int, price_anomalies: int, negative_volumes: int) -> float:
+    """Weighted data quality score (0-100) from missing value and anomaly counts"""
+    missing_score = 100 - (missing / (records * n_columns) * 100)
+    price_score = 100 - (price_anomalies / records * 100)
+    volume_score = 100 - (negative_volumes / records * 100)
+    overall_score = (missing_score * 0.4 + price_score * 0.4 + volume_score * 0.2)
+    return max(0, min(100, overall_score))
+
+
+def pct_change_std(values: np.ndarray, has_missing: bool) -> float:
+    """Sample std of the pct changes of values, matching pandas' pct_change().std() without a Series
+    
+    Gap-free arrays take one diff and divide; arrays with NaNs are forward-filled first like pandas.
+    """
+    if has_missing:
+        changes, _ = padded_pct_change(values, np.isnan(values), np.nan)
+        changes = changes[~np.isnan(changes)]
+    else:
+        changes = np.diff(values) / values[:-1]
+        undefined = np.isnan(changes)
+        if undefined.any():
+            changes = changes[~undefined]
+    return changes.std(ddof=1, dtype=np.float64) if changes.size > 1 else np.nan
+
+
+def to_native(obj):
+    """Copy of obj with NumPy values as Python scalars and lists, and other non-JSON types as strings
+    
+    Converting once up front lets the stdlib encoder run without a default= callback per unknown value.
+    """
+    if isinstance(obj, dict):
+        return {key if isinstance(key, str) else str(key): to_native(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [to_native(value) for value in obj]
+    if isinstance(obj, (str, int, float, bool)) or obj is None:
+        return obj
+    if isinstance(obj, (np.generic, np.ndarray)):
+        return to_native(obj.tolist())
+    return str(obj)
+
+def write_json(obj, path: Path):
+    """Write obj as indented JSON, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, default=str, option=ORJSON_OPTIONS))
+    else:
+        # dumps builds the text in one piece, where dump would issue a write per JSON token
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(json.dumps(to_native(obj), indent=2))
+
+def print_json(obj):
+    """Print obj as indented JSON without first building it as one Python string"""
+    stdout_bytes = getattr(sys.stdout, 'buffer', None)
+    if ORJSON_AVAILABLE and stdout_bytes is not None:
+        # Encoded bytes go straight to the binary stdout, skipping the text encoder
+        sys.stdout.flush()
+        stdout_bytes.write(orjson.dumps(obj, default=str, option=ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE))
+        stdout_bytes.flush()
+    else:
+        json.dump(to_native(obj), sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+def blocked_pair_spreads(closes: np.ndarray, first: np.ndarray, second: np.ndarray,
+                         block_rows: int = SPREAD_BLOCK_ROWS):
+    """Spreads of every exchange pair and their running statistics, computed tile by tile along time
+    
+    closes is (T, E); column k of the returned (T, P) spreads is pair (first[k], second[k]).
+    Each tile's count, mean and central moments (M2-M4) are merged into the running totals
+    (Pebay's pairwise update) so the spreads are read only once for count, mean, std, skew,
+    kurtosis, min and max. Missing prices are skipped like pandas.
+    """
+    n_rows, n_pairs = closes.shape[0], first.size
+    spreads = np.empty((n_rows, n_pairs), dtype=closes.dtype)
+    spreads_pct = np.empty((n_rows, n_pairs), dtype=closes.dtype)
+    
+    count = np.zeros(n_pairs)
+    mean = np.zeros(n_pairs)
+    m2 = np.zeros(n_pairs)
+    m3 = np.zeros(n_pairs)
+    m4 = np.zeros(n_pairs)
+    low = np.full(n_pairs, np.nan)
+    high = np.full(n_pairs, np.nan)
+    
+    for start in range(0, n_rows, block_rows):
+        block = closes[start:start + block_rows]
+        spread = np.subtract(block[:, first], block[:, second], out=spreads[start:start + block_rows])
+        pct = np.divide(spread, block[:, first], out=spreads_pct[start:start + block_rows])
+        pct *= 100
+        
+        # fmin/fmax ignore NaN without the all-NaN warnings of nanmin/nanmax
+        low = np.fmin(low, np.fmin.reduce(pct, axis=0))
+        high = np.fmax(high, np.fmax.reduce(pct, axis=0))
+        
+        # Central moments of the tile in float64, whatever the dtype of the spreads
+        valid = ~np.isnan(pct)
+        count_b = valid.sum(axis=0)
+        values = np.where(valid, pct.astype(np.float64, copy=False), 0.0)
+        mean_b = values.sum(axis=0) / np.maximum(count_b, 1)
+        deviation = np.where(valid, values - mean_b, 0.0)
+        squared = deviation * deviation
+        m2_b = squared.sum(axis=0)
+        m3_b = (squared * deviation).sum(axis=0)
+        m4_b = (squared * squared).sum(axis=0)
+        
+        # Merge with the running moments
+        total = count + count_b
+        safe_total = np.maximum(total, 1)
+        delta = mean_b - mean
+        cross = count * count_b
+        m4 = (m4 + m4_b
+              + delta ** 4 * cross * (count ** 2 - cross + count_b ** 2) / safe_total ** 3
+              + 6 * delta ** 2 * (count ** 2 * m2_b + count_b ** 2 * m2) / safe_total ** 2
+              + 4 * delta * (count * m3_b - count_b * m3) / safe_total)
+        m3 = (m3 + m3_b
+              + delta ** 3 * cross * (count - count_b) / safe_total ** 2
+              + 3 * delta * (count * m2_b - count_b * m2) / safe_total)
+        m2 = m2 + m2_b + delta ** 2 * cross / safe_total
+        mean = mean + delta * count_b / safe_total
+        count = total
+    
+    # Sample std and bias-corrected skewness/excess kurtosis, as pandas and scipy (bias=False) report them
+    with np.errstate(divide='ignore', invalid='ignore'):
+        variance = m2 / count
+        skewness = (m3 / count) / variance ** 1.5 * np.sqrt(count * (count - 1)) / (count - 2)
+        kurtosis = ((count ** 2 - 1) * (m4 / count) / variance ** 2 - 3 * (count - 1) ** 2) / ((count - 2) * (count - 3))
+        pair_stats = {
+            'count': count,
+            'mean': np.where(count > 0, mean, np.nan),
+            'std': np.where(count > 1, np.sqrt(m2 / (count - 1)), np.nan),
+            'min': low,
+            'max': high,
+            'skewness': np.where((count > 2) & (variance > 0), skewness, np.nan),
+            'kurtosis': np.where((count > 3) & (variance > 0), kurtosis, np.nan)
+        }
+    return spreads, spreads_pct, pair_stats
 
 class EnhancedCrossExchangeArbitrageAnalyzer:
     """Enhanced analyzer for cross-exchange arbitrage opportunities with step-by-step analysis"""
     
-    def __init__(self, data_folder: str = "full_data"):
+    def __init__(self, data_folder: str = "full_data", setup: bool = True):
         self.data_folder = Path(data_folder)
         self.exchanges = []
         self.coins = []
         self.data_summary = {}
         self.arbitrage_opportunities = {}
         self.analysis_steps = []
-        self.setup_analysis()
+        # Loaded frames per (exchange, coin) and per-coin exchange data, filled on first access
+        self._df_cache: Dict[Tuple[str, str], pd.DataFrame] = {}
+        self._exchange_data_cache: Dict[str, Dict[str, pd.DataFrame]] = {}
+        # Background reads of exchange-coin data, started by setup_analysis
+        self._prefetch_pool: Optional[ThreadPoolExecutor] = None
+        self._prefetch_futures: Dict[Tuple[str, str], Future] = {}
+        if setup:
+            self.setup_analysis()
     
     def setup_analysis(self):
         """Setup analysis environment and load data summary"""
@@ -63,6 +306,9 @@ class EnhancedCrossExchangeArbitrageAnalyzer:
         sns.set_palette("husl")
         plt.rcParams['figure.figsize'] = (15, 10)
         
+        # Parquet decode releases the GIL, so data can be read in the background while coins are analysed
+        self._prefetch_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='prefetch')
+        
         print("✅ Analysis environment setup complete")
         print("=" * 60)
     
@@ -93,30 +339,61 @@ class EnhancedCrossExchangeArbitrageAnalyzer:
         print(f"✅ Data structure discovery complete: {len(self.exchanges)} exchanges, {len(self.coins)} coins")
     
     def load_exchange_coin_data(self, exchange: str, coin: str) -> pd.DataFrame:
-        """Load data for a specific exchange-coin pair with enhanced error handling"""
+        """Load data for a specific exchange-coin pair, reading its parquet files only once"""
+        key = (exchange, coin)
+        cached = self._df_cache.get(key)
+        if cached is None:
+            future = self._prefetch_futures.pop(key, None)
+            data = future.result() if future is not None else self._read_exchange_coin_data(exchange, coin)
+            cached = self._df_cache[key] = data
+        return cached
+    
+    def prefetch_coin_data(self, coin: str):
+        """Start reading a coin's data for every exchange in the background, if setup started the prefetch pool"""
+        if self._prefetch_pool is None:
+            return
+        for exchange in self.exchanges:
+            key = (exchange, coin)
+            if key not in self._df_cache and key not in self._prefetch_futures:
+                self._prefetch_futures[key] = self._prefetch_pool.submit(self._read_exchange_coin_data, exchange, coin)
+    
+    def _read_exchange_coin_data(self, exchange: str, coin: str) -> pd.DataFrame:
+        """Read data for a specific exchange-coin pair with enhanced error handling"""
         exchange_folder = self.data_folder / "exchanges" / exchange / coin
         
         if not exchange_folder.exists():
             print(f"   ⚠️ No data folder found for {exchange}/{coin}")
             return pd.DataFrame()
         
-        # Load all parquet files and combine
-        all_data = []
         parquet_files = list(exchange_folder.glob("*.parquet"))
         
         print(f"   📁 Loading {len(parquet_files)} data files for {exchange}/{coin}")
         
-        for parquet_file in parquet_files:
+        combined_data = None
+        if parquet_files:
             try:
-                df = pd.read_parquet(parquet_file)
-                all_data.append(df)
+                combined_data = self._scan_parquet_files(parquet_files)
             except Exception as e:
-                print(f"   ❌ Error loading {parquet_file.name}: {e}")
-        
-        if all_data:
-            combined_data = pd.concat(all_data, ignore_index=False)
-            combined_data = combined_data.sort_index()
-            combined_data = combined_data[~combined_data.index.duplicated(keep='first')]
+                print(f"   ❌ Error scanning data files for {exchange}/{coin}, reading them one by one: {e}")
+                # Read the files separately so one unreadable file only loses its own rows
+                with ThreadPoolExecutor(max_workers=min(16, len(parquet_files))) as executor:
+                    all_data = [df for df in executor.map(self._read_parquet_file, parquet_files) if df is not None]
+                if all_data:
+                    # Stable sort so the first file's row wins among duplicates, near-linear on presorted runs
+                    combined_data = pd.concat(all_data, ignore_index=False).sort_index(kind='mergesort')
+        
+        if combined_data is not None and not combined_data.empty:
+            # The index is sorted, so duplicates are adjacent: one compare keeps the first of each
+            index_values = combined_data.index.to_numpy()
+            keep = np.empty(index_values.size, dtype=bool)
+            keep[:1] = True
+            np.not_equal(index_values[1:], index_values[:-1], out=keep[1:])
+            if not keep.all():
+                combined_data = combined_data[keep]
+            
+            # float32 keeps the 6-7 significant digits prices carry and halves memory traffic downstream
+            combined_data = combined_data.astype({column: np.float32 for column in LOAD_COLUMNS
+                                                  if column in combined_data.columns}, copy=False)
             
             # Basic data quality checks
             print(f"   ✅ Loaded {len(combined_data)} records for {exchange}/{coin}")
@@ -128,8 +405,32 @@ class EnhancedCrossExchangeArbitrageAnalyzer:
             print(f"   ⚠️ No data files found for {exchange}/{coin}")
             return pd.DataFrame()
     
-    def analyze_data_quality(self, coin: str) -> Dict:
-        """Step 2: Analyze data quality and completeness for each coin"""
+    def _scan_parquet_files(self, parquet_files: List[Path]) -> pd.DataFrame:
+        """Read the analysed columns of all files in one dataset scan, sorted by timestamp in Arrow"""
+        dataset = ds.dataset([str(f) for f in parquet_files], format='parquet')
+        has_timestamp = TIMESTAMP_COLUMN in dataset.schema.names
+        table = dataset.to_table(columns=[TIMESTAMP_COLUMN, *LOAD_COLUMNS] if has_timestamp else LOAD_COLUMNS,
+                                 use_threads=True)
+        if has_timestamp:
+            table = table.sort_by(TIMESTAMP_COLUMN)
+        data = table.to_pandas(self_destruct=True, split_blocks=True)
+        del table
+        # Files written from pandas carry metadata that already restores the timestamp as the index
+        return data.set_index(TIMESTAMP_COLUMN) if TIMESTAMP_COLUMN in data.columns else data
+    
+    def _read_parquet_file(self, parquet_file: Path):
+        """Read the analysed columns of one parquet file, returning None if it cannot be loaded"""
+        try:
+            return pd.read_parquet(parquet_file, columns=LOAD_COLUMNS)
+        except Exception as e:
+            print(f"   ❌ Error loading {parquet_file.name}: {e}")
+            return None
+    
+    def analyze_data_quality(self, coin: str, materialize: bool = True) -> Dict:
+        """Step 2: Analyze data quality and completeness for each coin
+        
+        With materialize=False each exchange is scanned in record batches instead of being loaded.
+        """
         print(f"\n📊 Step 2: Data Quality Analysis for {coin}...")
         
         quality_report = {
@@ -144,32 +445,18 @@ class EnhancedCrossExchangeArbitrageAnalyzer:
         exchange_coverage = {}
         
         for exchange in self.exchanges:
-            data = self.load_exchange_coin_data(exchange, coin)
-            if not data.empty:
-                # Data quality metrics
-                missing_data = data.isnull().sum()
-                price_volatility = data['close'].pct_change().std() * 100
-                volume_stats = {
-                    'total_volume': data['volume'].sum(),
-                    'avg_volume': data['volume'].mean(),
-                    'volume_volatility': data['volume'].pct_change().std() * 100
-                }
-                
-                exchange_coverage[exchange] = {
-                    'records': len(data),
-                    'date_range': f"{data.index.min()} to {data.index.max()}",
-                    'missing_data': missing_data.to_dict(),
-                    'price_volatility': price_volatility,
-                    'volume_stats': volume_stats,
-                    'data_quality_score': self.calculate_data_quality_score(data)
-                }
-                
-                total_records += len(data)
-                total_missing += missing_data.sum().sum()
+            if materialize:
+                report = self.frame_quality_report(self.load_exchange_coin_data(exchange, coin))
+            else:
+                report = self.stream_quality_report(exchange, coin)
+            exchange_coverage[exchange] = report
+            
+            if report is not None:
+                total_records += report['records']
+                total_missing += sum(report['missing_data'].values())
                 
-                print(f"   📈 {exchange}: {len(data)} records, {price_volatility:.2f}% price volatility")
+                print(f"   📈 {exchange}: {report['records']} records, {report['price_volatility']:.2f}% price volatility")
             else:
-                exchange_coverage[exchange] = None
                 print(f"   ❌ {exchange}: No data available")
         
         # Overall quality assessment
@@ -203,102 +490,251 @@ class EnhancedCrossExchangeArbitrageAnalyzer:
         
         return quality_report
     
-    def calculate_data_quality_score(self, data: pd.DataFrame) -> float:
-        """Calculate a data quality score (0-100)"""
+    def load_coin_exchange_data(self, coin: str) -> Dict[str, pd.DataFrame]:
+        """Non-empty data for a coin keyed by exchange, built once per coin"""
+        exchange_data = self._exchange_data_cache.get(coin)
+        if exchange_data is None:
+            exchange_data = {}
+            for exchange in self.exchanges:
+                data = self.load_exchange_coin_data(exchange, coin)
+                if not data.empty:
+                    exchange_data[exchange] = data
+            self._exchange_data_cache[coin] = exchange_data
+        return exchange_data
+    
+    def frame_quality_report(self, data: pd.DataFrame) -> Optional[Dict]:
+        """Quality metrics of one loaded exchange-coin frame, or None if it is empty"""
+        if data.empty:
+            return None
+        
+        # Data quality metrics; one NaN mask serves the per-column counts and the quality score
+        missing_per_column = np.isnan(data.to_numpy()).sum(axis=0)
+        missing_data = {column: int(count) for column, count in zip(data.columns, missing_per_column)}
+        volume_stats = {
+            'total_volume': data['volume'].sum(),
+            'avg_volume': data['volume'].mean(),
+            'volume_volatility': pct_change_std(data['volume'].to_numpy(), missing_data['volume'] > 0) * 100
+        }
+        
+        return {
+            'records': len(data),
+            'date_range': f"{data.index.min()} to {data.index.max()}",
+            'missing_data': missing_data,
+            'price_volatility': pct_change_std(data['close'].to_numpy(), missing_data['close'] > 0) * 100,
+            'volume_stats': volume_stats,
+            'data_quality_score': self.calculate_data_quality_score(data, int(missing_per_column.sum()))
+        }
+    
+    def stream_row_groups(self, parquet_files: List[Path], columns: List[str] = LOAD_COLUMNS,
+                          batch_size: int = STREAM_BATCH_SIZE):
+        """Yield record batches of the given columns from parquet files in the order given"""
+        for parquet_file in parquet_files:
+            try:
+                parquet = pq.ParquetFile(parquet_file)
+                present = [c for c in columns if c in parquet.schema_arrow.names]
+                yield from parquet.iter_batches(batch_size=batch_size, columns=present)
+            except Exception as e:
+                print(f"   ❌ Error loading {parquet_file.name}: {e}")
+    
+    def stream_quality_report(self, exchange: str, coin: str) -> Optional[Dict]:
+        """Quality metrics of an exchange-coin pair computed batch by batch, keeping memory flat
+        
+        Files are streamed in footer start-time order, which needs disjoint shard time ranges and
+        rows sorted within each shard; repeats of the previous timestamp are skipped, matching the
+        loader's sort-then-dedup. Otherwise the pair is loaded and reported from its sorted frame.
+        Volatilities come from running pct-change moments and the extreme price check re-scans the
+        close column only if the maximum price exceeds ten times the mean.
+        """
+        exchange_folder = self.data_folder / "exchanges" / exchange / coin
+        parquet_files = sorted(exchange_folder.glob("*.parquet")) if exchange_folder.exists() else []
+        if not parquet_files:
+            return None
+        try:
+            ordered_files = disjoint_file_order(parquet_files)
+        except Exception:
+            ordered_files = None
+        if ordered_files is None:
+            # Overlapping (or unreadable) footers: only a sort can order the rows
+            return self.frame_quality_report(self.load_exchange_coin_data(exchange, coin))
+        
+        records = 0
+        missing = dict.fromkeys(LOAD_COLUMNS, 0)
+        first_timestamp = last_timestamp = None
+        close_moments = (0, 0.0, 0.0)
+        close_max = -np.inf
+        nonpositive_prices = 0
+        volume_sum = 0.0
+        volume_count = 0
+        negative_volumes = 0
+        change_moments = {'close': (0, 0.0, 0.0), 'volume': (0, 0.0, 0.0)}
+        previous = {'close': np.nan, 'volume': np.nan}
+        
+        for batch in self.stream_row_groups(ordered_files, [TIMESTAMP_COLUMN, *LOAD_COLUMNS]):
+            columns = {name: batch.column(name).to_numpy(zero_copy_only=False) for name in batch.schema.names}
+            timestamps = columns[TIMESTAMP_COLUMN].astype('datetime64[ns]').view('int64')
+            keep = new_timestamp_mask(timestamps, last_timestamp)
+            if keep is None:
+                # A shard is not sorted by time, so streaming cannot de-duplicate it
+                return self.frame_quality_report(self.load_exchange_coin_data(exchange, coin))
+            if not keep.all():
+                columns = {name: values[keep] for name, values in columns.items()}
+                timestamps = timestamps[keep]
+            
+            n_rows = timestamps.size
+            if not n_rows:
+                continue
+            first_timestamp = timestamps[0] if first_timestamp is None else first_timestamp
+            last_timestamp = timestamps[-1]
+            records += n_rows
+            
+            for column in LOAD_COLUMNS:
+                missing[column] += np.count_nonzero(np.isnan(columns[column])) if column in columns else n_rows
+            
+            if 'close' in columns:
+                close = columns['close']
+                valid_close = close[~np.isnan(close)]
+                close_moments = merge_moments(close_moments, valid_close)
+                if valid_close.size:
+                    close_max = max(close_max, valid_close.max())
+                nonpositive_prices += np.count_nonzero(valid_close <= 0)
+            
+            if 'volume' in columns:
+                volume = columns['volume']
+                valid_volume = volume[~np.isnan(volume)]
+                volume_sum += valid_volume.sum(dtype=np.float64)
+                volume_count += valid_volume.size
+                negative_volumes += np.count_nonzero(valid_volume < 0)
+            
+            for column in change_moments:
+                if column in columns:
+                    values = columns[column]
+                    changes, previous[column] = padded_pct_change(values, np.isnan(values), previous[column])
+                    change_moments[column] = merge_moments(change_moments[column], changes[~np.isnan(changes)])
+        
+        if not records:
+            return None
+        
+        # Second pass over close only when some price can exceed the extreme threshold,
+        # skipping the same repeated timestamps as the first pass
+        extreme_prices = 0
+        threshold = close_moments[1] * 10
+        if close_moments[0] and close_max > threshold:
+            last_timestamp = None
+            for batch in self.stream_row_groups(ordered_files, [TIMESTAMP_COLUMN, 'close']):
+                timestamps = batch.column(TIMESTAMP_COLUMN).to_numpy(zero_copy_only=False).astype('datetime64[ns]').view('int64')
+                if not timestamps.size:
+                    continue
+                keep = new_timestamp_mask(timestamps, last_timestamp)
+                last_timestamp = timestamps[-1]
+                close = batch.column('close').to_numpy(zero_copy_only=False)
+                extreme_prices += np.count_nonzero((close if keep is None else close[keep]) > threshold)
+        
+        def sample_std(moments: Tuple[int, float, float]) -> float:
+            count, _, m2 = moments
+            return np.sqrt(m2 / (count - 1)) if count > 1 else np.nan
+        
+        return {
+            'records': records,
+            'date_range': f"{pd.Timestamp(first_timestamp)} to {pd.Timestamp(last_timestamp)}",
+            'missing_data': missing,
+            'price_volatility': sample_std(change_moments['close']) * 100,
+            'volume_stats': {
+                'total_volume': volume_sum,
+                'avg_volume': volume_sum / volume_count if volume_count else np.nan,
+                'volume_volatility': sample_std(change_moments['volume']) * 100
+            },
+            'data_quality_score': quality_score(records, len(LOAD_COLUMNS), sum(missing.values()),
+                                                nonpositive_prices + extreme_prices, negative_volumes)
+        }
+    
+    def calculate_data_quality_score(self, data: pd.DataFrame, missing: Optional[int] = None) -> float:
+        """Calculate a data quality score (0-100), reusing the missing value count if already known"""
         if data.empty:
             return 0.0
         
         # Check for missing values
-        missing_score = 100 - (data.isnull().sum().sum() / (len(data) * len(data.columns)) * 100)
+        if missing is None:
+            missing = np.count_nonzero(np.isnan(data.to_numpy()))
         
         # Check for price anomalies (negative prices, extreme values)
-        price_score = 100
+        price_anomalies = 0
         if 'close' in data.columns:
-            negative_prices = (data['close'] <= 0).sum()
-            extreme_prices = (data['close'] > data['close'].mean() * 10).sum()
-            price_score = 100 - ((negative_prices + extreme_prices) / len(data) * 100)
+            negative_prices, extreme_prices = count_price_anomalies(data['close'].to_numpy())
+            price_anomalies = negative_prices + extreme_prices
         
         # Check for volume anomalies
-        volume_score = 100
+        negative_volume = 0
         if 'volume' in data.columns:
-            negative_volume = (data['volume'] < 0).sum()
-            volume_score = 100 - (negative_volume / len(data) * 100)
+            negative_volume = np.count_nonzero(data['volume'].to_numpy() < 0)
         
-        # Overall score (weighted average)
-        overall_score = (missing_score * 0.4 + price_score * 0.4 + volume_score * 0.2)
-        return max(0, min(100, overall_score))
+        return quality_score(len(data), len(data.columns), missing, price_anomalies, negative_volume)
     
-    def calculate_cross_exchange_spreads(self, coin: str) -> pd.DataFrame:
-        """Step 3: Calculate detailed spreads between exchanges for a specific coin"""
-        print(f"\n📊 Step 3: Cross-Exchange Spread Analysis for {coin}...")
+    def calculate_cross_exchange_spreads(self, coin: str) -> Tuple[pd.DataFrame, Dict[Tuple[str, str], np.ndarray],
+                                                                   Dict[str, np.ndarray]]:
+        """Step 3: Calculate detailed spreads between exchanges for a specific coin
         
-        exchange_data = {}
+        Returns the comparison frame, the percentage spread array of each (ex1, ex2) pair and
+        the volume array of each exchange, all aligned on the common timestamps.
+        """
+        print(f"\n📊 Step 3: Cross-Exchange Spread Analysis for {coin}...")
         
-        # Load data from all exchanges for this coin
-        for exchange in self.exchanges:
-            data = self.load_exchange_coin_data(exchange, coin)
-            if not data.empty:
-                exchange_data[exchange] = data
+        exchange_data = self.load_coin_exchange_data(coin)
         
         if len(exchange_data) < 2:
             print(f"   ⚠️ Need at least 2 exchanges with data for {coin}")
-            return pd.DataFrame()
+            return pd.DataFrame(), {}, {}
         
-        # Find common time periods
-        common_times = None
-        for exchange, data in exchange_data.items():
-            if common_times is None:
-                common_times = set(data.index)
-            else:
-                common_times = common_times.intersection(set(data.index))
+        # Align exchanges on their common time periods with one inner join on the index
+        comparison_df = pd.concat(
+            [data[LOAD_COLUMNS].add_prefix(f"{exchange}_") for exchange, data in exchange_data.items()],
+            axis=1, join='inner'
+        ).sort_index()
         
-        if not common_times:
+        if comparison_df.empty:
             print(f"   ⚠️ No common time periods found for {coin}")
-            return pd.DataFrame()
+            return pd.DataFrame(), {}, {}
         
-        print(f"   📅 Found {len(common_times)} common time periods")
+        print(f"   📅 Found {len(comparison_df)} common time periods")
         
-        # Create comparison DataFrame
-        comparison_data = {}
-        for exchange, data in exchange_data.items():
-            common_data = data.loc[list(common_times)]
-            comparison_data[f"{exchange}_close"] = common_data['close']
-            comparison_data[f"{exchange}_volume"] = common_data['volume']
-            comparison_data[f"{exchange}_high"] = common_data['high']
-            comparison_data[f"{exchange}_low"] = common_data['low']
-        
-        comparison_df = pd.DataFrame(comparison_data)
-        
-        # Calculate spreads between exchanges
+        # Calculate spreads between every pair of exchanges at once; column k holds pair (first[k], second[k])
         exchanges_list = list(exchange_data.keys())
+        closes = comparison_df[[f"{exchange}_close" for exchange in exchanges_list]].to_numpy()
+        first, second = np.triu_indices(len(exchanges_list), k=1)
+        spreads, spreads_pct, moment_stats = blocked_pair_spreads(closes, first, second)
+        
+        # Spread statistics for all pairs; the median needs the whole series so it is taken separately,
+        # with one partition over every pair when no spread is missing (nanmedian loops pair by pair)
+        if (moment_stats['count'] == len(spreads_pct)).all():
+            medians = np.median(spreads_pct, axis=0)
+        else:
+            medians = np.nanmedian(spreads_pct, axis=0)
+        pair_stats = {
+            'mean': moment_stats['mean'],
+            'std': moment_stats['std'],
+            'min': moment_stats['min'],
+            'max': moment_stats['max'],
+            'median': medians,
+            'skewness': moment_stats['skewness'],
+            'kurtosis': moment_stats['kurtosis']
+        }
+        
         spread_analysis = {}
+        spread_columns = {}
+        spread_arrays = {}
+        for k, (i, j) in enumerate(zip(first, second)):
+            ex1, ex2 = exchanges_list[i], exchanges_list[j]
+            spread_arrays[(ex1, ex2)] = spreads_pct[:, k]
+            spread_columns[f"spread_{ex1}_vs_{ex2}"] = spreads[:, k]
+            spread_columns[f"spread_pct_{ex1}_vs_{ex2}"] = spreads_pct[:, k]
+            
+            spread_stats = {name: values[k] for name, values in pair_stats.items()}
+            spread_analysis[f"{ex1}_vs_{ex2}"] = spread_stats
+            
+            print(f"   📊 {ex1} vs {ex2}: {spread_stats['mean']:.4f}% ± {spread_stats['std']:.4f}%")
         
-        for i in range(len(exchanges_list)):
-            for j in range(i + 1, len(exchanges_list)):
-                ex1, ex2 = exchanges_list[i], exchanges_list[j]
-                spread_col = f"spread_{ex1}_vs_{ex2}"
-                spread_pct_col = f"spread_pct_{ex1}_vs_{ex2}"
-                
-                # Absolute spread
-                comparison_df[spread_col] = comparison_df[f"{ex1}_close"] - comparison_df[f"{ex2}_close"]
-                
-                # Percentage spread
-                comparison_df[spread_pct_col] = (comparison_df[spread_col] / comparison_df[f"{ex1}_close"]) * 100
-                
-                # Spread statistics
-                spread_stats = {
-                    'mean': comparison_df[spread_pct_col].mean(),
-                    'std': comparison_df[spread_pct_col].std(),
-                    'min': comparison_df[spread_pct_col].min(),
-                    'max': comparison_df[spread_pct_col].max(),
-                    'median': comparison_df[spread_pct_col].median(),
-                    'skewness': comparison_df[spread_pct_col].skew(),
-                    'kurtosis': comparison_df[spread_pct_col].kurtosis()
-                }
-                
-                spread_analysis[f"{ex1}_vs_{ex2}"] = spread_stats
-                
-                print(f"   📊 {ex1} vs {ex2}: {spread_stats['mean']:.4f}% ± {spread_stats['std']:.4f}%")
+        comparison_df = pd.concat([comparison_df, pd.DataFrame(spread_columns, index=comparison_df.index)], axis=1)
+        print(f"   💾 Comparison data: {comparison_df.memory_usage(deep=True).sum() / 1e6:.1f} MB "
+              f"({len(comparison_df.columns)} float32 columns)")
         
         # Record analysis step
         self.analysis_steps.append({
@@ -306,17 +742,24 @@ class EnhancedCrossExchangeArbitrageAnalyzer:
             'title': 'Cross-Exchange Spread Analysis',
             'description': f'Calculated spreads for {coin} across {len(exchanges_list)} exchanges',
             'spread_analysis': spread_analysis,
-            'common_periods': len(common_times)
+            'common_periods': len(comparison_df)
         })
         
+        volume_arrays = {exchange: comparison_df[f"{exchange}_volume"].to_numpy() for exchange in exchanges_list}
+        
         print(f"✅ Spread analysis complete for {coin}")
-        return comparison_df
+        return comparison_df, spread_arrays, volume_arrays
     
-    def identify_arbitrage_opportunities(self, coin: str, min_spread_pct: float = 0.1) -> Dict:
-        """Step 4: Identify and analyze arbitrage opportunities for a specific coin"""
+    def identify_arbitrage_opportunities(self, coin: str, min_spread_pct: float = 0.1, spreads: Tuple = None) -> Dict:
+        """Step 4: Identify and analyze arbitrage opportunities for a specific coin
+        
+        spreads takes a precomputed calculate_cross_exchange_spreads result; it is computed if omitted.
+        """
         print(f"\n🎯 Step 4: Arbitrage Opportunity Identification for {coin} (min spread: {min_spread_pct}%)...")
         
-        comparison_df = self.calculate_cross_exchange_spreads(coin)
+        if spreads is None:
+            spreads = self.calculate_cross_exchange_spreads(coin)
+        comparison_df, spread_arrays, volume_arrays = spreads
         if comparison_df.empty:
             return {}
         
@@ -329,36 +772,40 @@ class EnhancedCrossExchangeArbitrageAnalyzer:
             'timing_analysis': {}
         }
         
-        # Find spread columns
-        spread_cols = [col for col in comparison_df.columns if col.startswith('spread_pct_')]
+        spread_cols = [f"spread_pct_{ex1}_vs_{ex2}" for ex1, ex2 in spread_arrays]
         
-        for spread_col in spread_cols:
-            # Extract exchange names
-            ex1, ex2 = spread_col.replace('spread_pct_', '').split('_vs_')
-            
-            # Find opportunities above threshold
-            above_threshold = comparison_df[comparison_df[spread_col] > min_spread_pct]
+        for (ex1, ex2), spread_pct in spread_arrays.items():
+            # Find opportunities above threshold with one mask and one gather, no filtered DataFrame
+            mask = spread_pct > min_spread_pct
+            above_threshold = spread_pct[mask]
             
-            if len(above_threshold) > 0:
+            if above_threshold.size > 0:
                 # Calculate opportunity metrics
+                avg_spread = above_threshold.mean()
+                volume1 = volume_arrays[ex1][mask]
+                volume2 = volume_arrays[ex2][mask]
                 opportunity = {
                     'exchange_pair': f"{ex1}_vs_{ex2}",
-                    'buy_exchange': ex1 if above_threshold[spread_col].mean() > 0 else ex2,
-                    'sell_exchange': ex2 if above_threshold[spread_col].mean() > 0 else ex1,
-                    'opportunity_count': len(above_threshold),
-                    'opportunity_percentage': len(above_threshold) / len(comparison_df) * 100,
-                    'max_spread': above_threshold[spread_col].max(),
-                    'avg_spread': above_threshold[spread_col].mean(),
-                    'min_spread': above_threshold[spread_col].min(),
-                    'spread_volatility': above_threshold[spread_col].std(),
-                    'total_volume': above_threshold[f"{ex1}_volume"].sum() + above_threshold[f"{ex2}_volume"].sum(),
-                    'avg_volume': above_threshold[f"{ex1}_volume"].mean() + above_threshold[f"{ex2}_volume"].mean()
+                    'buy_exchange': ex1 if avg_spread > 0 else ex2,
+                    'sell_exchange': ex2 if avg_spread > 0 else ex1,
+                    'opportunity_count': above_threshold.size,
+                    'opportunity_percentage': above_threshold.size / len(comparison_df) * 100,
+                    'max_spread': above_threshold.max(),
+                    'avg_spread': avg_spread,
+                    'min_spread': above_threshold.min(),
+                    'spread_volatility': above_threshold.std(ddof=1) if above_threshold.size > 1 else np.nan,
+                    'total_volume': np.nansum(volume1, dtype=np.float64) + np.nansum(volume2, dtype=np.float64),
+                    'avg_volume': np.nanmean(volume1, dtype=np.float64) + np.nanmean(volume2, dtype=np.float64)
                 }
                 
                 # Risk analysis
                 opportunity['risk_score'] = self.calculate_risk_score(opportunity)
                 opportunity['profitability_score'] = self.calculate_profitability_score(opportunity)
                 
+                # Composite score (profitability - risk) ranks pairs across coins in the report
+                opportunity['coin'] = coin
+                opportunity['composite_score'] = opportunity['profitability_score'] - opportunity['risk_score']
+                
                 opportunities['opportunities'].append(opportunity)
         
         # Calculate summary statistics
@@ -394,6 +841,21 @@ class EnhancedCrossExchangeArbitrageAnalyzer:
         
         return opportunities
     
+    def analyze_coin(self, coin: str, min_spread_pct: float = 0.1) -> Tuple[Dict, Dict]:
+        """Steps 2-4 for one coin on data loaded once, returning its quality report and opportunities
+        
+        The coin's frames are dropped from the load caches afterwards since no later step reads them.
+        """
+        quality_report = self.analyze_data_quality(coin)
+        spreads = self.calculate_cross_exchange_spreads(coin)
+        opportunities = self.identify_arbitrage_opportunities(coin, min_spread_pct, spreads=spreads)
+        
+        self._exchange_data_cache.pop(coin, None)
+        for exchange in self.exchanges:
+            self._df_cache.pop((exchange, coin), None)
+        
+        return quality_report, opportunities
+    
     def calculate_risk_score(self, opportunity: Dict) -> float:
         """Calculate risk score (0-100, higher = more risky)"""
         risk_score = 0
@@ -471,13 +933,15 @@ class EnhancedCrossExchangeArbitrageAnalyzer:
         """Analyze timing patterns of arbitrage opportunities"""
         timing_analysis = {}
         
+        # Calculate hourly patterns for every pair with one groupby
+        hours = pd.Index(comparison_df.index.hour, name='hour')
+        hourly = comparison_df[spread_cols].groupby(hours).agg(['mean', 'std', 'count'])
+        
         for spread_col in spread_cols:
             # Extract exchange names
             ex1, ex2 = spread_col.replace('spread_pct_', '').split('_vs_')
             
-            # Calculate hourly patterns
-            comparison_df['hour'] = comparison_df.index.hour
-            hourly_spreads = comparison_df.groupby('hour')[spread_col].agg(['mean', 'std', 'count'])
+            hourly_spreads = hourly[spread_col]
             
             # Find best hours for arbitrage
             best_hours = hourly_spreads.nlargest(3, 'mean')
@@ -491,38 +955,46 @@ class EnhancedCrossExchangeArbitrageAnalyzer:
         
         return timing_analysis
     
-    def run_complete_enhanced_analysis(self, min_spread_pct: float = 0.1):
-        """Run complete enhanced arbitrage analysis pipeline with step-by-step insights"""
+    def run_complete_enhanced_analysis(self, min_spread_pct: float = 0.1, workers: int = 1):
+        """Run complete enhanced arbitrage analysis pipeline with step-by-step insights
+        
+        With workers > 1 the per-coin analysis (steps 2-4) runs in that many processes.
+        """
         print("🚀 Starting Enhanced Cross-Exchange Arbitrage Analysis Pipeline...")
         print("=" * 80)
         
         # Step 1: Data Structure Discovery (already done in setup)
         print("✅ Step 1 Complete: Data Structure Discovery")
         
-        # Step 2: Data Quality Analysis for all coins
-        print("\n📊 Step 2: Comprehensive Data Quality Analysis...")
         quality_reports = {}
-        for coin in self.coins:
-            quality_reports[coin] = self.analyze_data_quality(coin)
-        
-        # Step 3: Cross-Exchange Spread Analysis
-        print("\n📊 Step 3: Cross-Exchange Spread Analysis...")
-        spread_analysis = {}
-        for coin in self.coins:
-            spread_analysis[coin] = self.calculate_cross_exchange_spreads(coin)
-        
-        # Step 4: Arbitrage Opportunity Identification
-        print("\n🎯 Step 4: Arbitrage Opportunity Identification...")
         all_opportunities = {}
         total_opportunities = 0
         
-        for coin in self.coins:
-            print(f"\n   📊 Analyzing {coin}...")
-            opportunities = self.identify_arbitrage_opportunities(coin, min_spread_pct)
-            all_opportunities[coin] = opportunities
-            
-            if opportunities and opportunities.get('summary'):
-                total_opportunities += opportunities['summary']['total_opportunities']
+        if workers > 1 and len(self.coins) > 1:
+            # Steps 2-4: each coin is independent, so whole coins are analysed in worker processes
+            print(f"\n📊 Steps 2-4: Per-Coin Analysis in {min(workers, len(self.coins))} processes...")
+            task = partial(_analyze_coin_task, str(self.data_folder), self.exchanges, min_spread_pct=min_spread_pct)
+            with ProcessPoolExecutor(max_workers=min(workers, len(self.coins))) as pool:
+                for coin, (quality_report, opportunities, steps) in zip(self.coins, pool.map(task, self.coins)):
+                    quality_reports[coin] = quality_report
+                    all_opportunities[coin] = opportunities
+                    self.analysis_steps.extend(steps)
+                    
+                    if opportunities and opportunities.get('summary'):
+                        total_opportunities += opportunities['summary']['total_opportunities']
+        else:
+            # Steps 2-4 fused per coin, so each coin's data is loaded once and its spreads computed once
+            print("\n📊 Steps 2-4: Quality, Spread and Opportunity Analysis per Coin...")
+            for i, coin in enumerate(self.coins):
+                # Read this coin and the next one ahead, so decode overlaps the analysis while at most two coins are held
+                for upcoming in self.coins[i:i + 2]:
+                    self.prefetch_coin_data(upcoming)
+                print(f"\n   📊 Analyzing {coin}...")
+                quality_reports[coin], opportunities = self.analyze_coin(coin, min_spread_pct)
+                all_opportunities[coin] = opportunities
+                
+                if opportunities and opportunities.get('summary'):
+                    total_opportunities += opportunities['summary']['total_opportunities']
         
         # Step 5: Comprehensive Analysis Summary
         print("\n📋 Step 5: Generating Comprehensive Analysis Summary...")
@@ -546,7 +1018,7 @@ class EnhancedCrossExchangeArbitrageAnalyzer:
         
         # Step 7: Generate Comprehensive Report
         print("\n📋 Step 7: Generating Comprehensive Analysis Report...")
-        report = self.generate_enhanced_report(all_opportunities)
+        self.generate_enhanced_report(all_opportunities)
         
         # Step 8: Save All Analysis Results
         print("\n💾 Step 8: Saving Analysis Results...")
@@ -571,60 +1043,54 @@ class EnhancedCrossExchangeArbitrageAnalyzer:
     
     def create_opportunity_summary_charts(self, opportunities: Dict):
         """Create opportunity summary charts"""
-        coins_with_opps = [coin for coin, data in opportunities.items() 
-                          if isinstance(data, dict) and data.get('opportunities')]
+        # Only the analysed coins' entries, so no type guard is needed to skip 'overall_summary'
+        coin_entries = [(coin, opportunities[coin]) for coin in self.coins
+                        if coin in opportunities and opportunities[coin].get('opportunities')]
         
-        if not coins_with_opps:
+        if not coin_entries:
             return
         
-        # Create subplots
-        fig, axes = plt.subplots(2, 2, figsize=(20, 15))
-        fig.suptitle('Enhanced Arbitrage Opportunity Analysis', fontsize=16, fontweight='bold')
-        
-        # Opportunities per coin
-        opp_counts = [opportunities[coin]['summary']['total_opportunities'] for coin in coins_with_opps]
-        axes[0,0].bar(coins_with_opps, opp_counts, color='skyblue', alpha=0.7)
-        axes[0,0].set_title('Total Arbitrage Opportunities per Coin')
-        axes[0,0].set_ylabel('Number of Opportunities')
-        axes[0,0].tick_params(axis='x', rotation=45)
-        
-        # Average spreads per coin
-        avg_spreads = [opportunities[coin]['summary']['average_spread'] for coin in coins_with_opps]
-        axes[0,1].bar(coins_with_opps, avg_spreads, color='lightgreen', alpha=0.7)
-        axes[0,1].set_title('Average Spread per Coin')
-        axes[0,1].set_ylabel('Spread (%)')
-        axes[0,1].tick_params(axis='x', rotation=45)
-        
-        # Opportunity rates per coin
-        opp_rates = [opportunities[coin]['summary']['overall_opportunity_rate'] for coin in coins_with_opps]
-        axes[1,0].bar(coins_with_opps, opp_rates, color='gold', alpha=0.7)
-        axes[1,0].set_title('Opportunity Rate per Coin')
-        axes[1,0].set_ylabel('Opportunity Rate (%)')
-        axes[1,0].tick_params(axis='x', rotation=45)
-        
-        # Risk vs Profitability scatter
-        risk_scores = []
-        profit_scores = []
-        for coin in coins_with_opps:
-            for opp in opportunities[coin]['opportunities']:
-                risk_scores.append(opp['risk_score'])
-                profit_scores.append(opp['profitability_score'])
-        
-        if risk_scores and profit_scores:
-            axes[1,1].scatter(risk_scores, profit_scores, alpha=0.6, color='red')
-            axes[1,1].set_xlabel('Risk Score')
-            axes[1,1].set_ylabel('Profitability Score')
-            axes[1,1].set_title('Risk vs Profitability Analysis')
-            axes[1,1].grid(True, alpha=0.3)
-        
-        plt.tight_layout()
-        
-        # Save visualization
-        viz_file = self.data_folder / "analysis" / "enhanced_arbitrage_analysis.png"
-        plt.savefig(viz_file, dpi=300, bbox_inches='tight')
+        # Chart data gathered once per series
+        coins = np.array([coin for coin, _ in coin_entries])
+        summaries = [data['summary'] for _, data in coin_entries]
+        opp_counts = np.fromiter((summary['total_opportunities'] for summary in summaries), dtype=np.int64, count=len(summaries))
+        avg_spreads = np.fromiter((summary['average_spread'] for summary in summaries), dtype=np.float64, count=len(summaries))
+        opp_rates = np.fromiter((summary['overall_opportunity_rate'] for summary in summaries), dtype=np.float64, count=len(summaries))
+        pair_opps = [opp for _, data in coin_entries for opp in data['opportunities']]
+        risk_scores = np.fromiter((opp['risk_score'] for opp in pair_opps), dtype=np.float64, count=len(pair_opps))
+        profit_scores = np.fromiter((opp['profitability_score'] for opp in pair_opps), dtype=np.float64, count=len(pair_opps))
+        
+        # One Plotly figure with all four panels
+        fig = make_subplots(rows=2, cols=2, subplot_titles=(
+            'Total Arbitrage Opportunities per Coin', 'Average Spread per Coin',
+            'Opportunity Rate per Coin', 'Risk vs Profitability Analysis'))
+        fig.add_trace(go.Bar(x=coins, y=opp_counts, marker_color='skyblue', opacity=0.7), row=1, col=1)
+        fig.add_trace(go.Bar(x=coins, y=avg_spreads, marker_color='lightgreen', opacity=0.7), row=1, col=2)
+        fig.add_trace(go.Bar(x=coins, y=opp_rates, marker_color='gold', opacity=0.7), row=2, col=1)
+        fig.add_trace(go.Scatter(x=risk_scores, y=profit_scores, mode='markers', marker_color='red', opacity=0.6),
+                      row=2, col=2)
+        fig.update_yaxes(title_text='Number of Opportunities', row=1, col=1)
+        fig.update_yaxes(title_text='Spread (%)', row=1, col=2)
+        fig.update_yaxes(title_text='Opportunity Rate (%)', row=2, col=1)
+        fig.update_xaxes(title_text='Risk Score', row=2, col=2)
+        fig.update_yaxes(title_text='Profitability Score', row=2, col=2)
+        fig.update_xaxes(tickangle=45, row=1)
+        fig.update_xaxes(tickangle=45, row=2, col=1)
+        fig.update_layout(title_text='Enhanced Arbitrage Opportunity Analysis', title_font_size=16,
+                          showlegend=False, width=1600, height=1200)
+        
+        # Save visualization (static PNG needs kaleido; interactive HTML otherwise)
+        analysis_folder = self.data_folder / "analysis"
+        if KALEIDO_AVAILABLE:
+            viz_file = analysis_folder / "enhanced_arbitrage_analysis.png"
+            fig.write_image(viz_file, scale=2)
+        else:
+            viz_file = analysis_folder / "enhanced_arbitrage_analysis.html"
+            fig.write_html(viz_file, include_plotlyjs='cdn')
         print(f"   💾 Saved opportunity summary charts to {viz_file}")
         
-        plt.show()
+        if sys.stdout.isatty():
+            fig.show()
     
     def create_risk_profitability_analysis(self, opportunities: Dict):
         """Create risk vs profitability analysis charts"""
@@ -641,138 +1107,130 @@ class EnhancedCrossExchangeArbitrageAnalyzer:
         # Implementation for data quality charts
         pass
     
-    def generate_enhanced_report(self, opportunities: Dict) -> str:
-        """Generate comprehensive enhanced analysis report"""
+    def generate_enhanced_report(self, opportunities: Dict, return_text: bool = False) -> Optional[str]:
+        """Generate comprehensive enhanced analysis report
+        
+        Lines are written straight to the report file; with return_text the report is also returned.
+        """
         print("   📋 Generating enhanced analysis report...")
         
-        report = []
-        report.append("# Enhanced Cross-Exchange Arbitrage Opportunity Analysis Report")
-        report.append(f"**Generated:** {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        report.append(f"**Data Source:** {self.data_folder}")
-        report.append(f"**Exchanges Analyzed:** {', '.join(self.exchanges)}")
-        report.append(f"**Coins Analyzed:** {', '.join(self.coins)}")
-        report.append("")
+        report_file = self.data_folder / "analysis" / "enhanced_arbitrage_analysis_report.md"
+        report_text = None
+        if return_text:
+            buf = io.StringIO()
+            self._write_enhanced_report(buf, opportunities)
+            report_text = buf.getvalue()
+            with open(report_file, 'w', encoding='utf-8', newline='') as f:
+                f.write(report_text)
+        else:
+            # A 1 MB buffer turns the many short line writes into a few large ones, and newline=''
+            # writes '\n' as is instead of translating every write to the platform line ending
+            with open(report_file, 'w', encoding='utf-8', newline='', buffering=1 << 20) as f:
+                self._write_enhanced_report(f, opportunities)
+        
+        print(f"   💾 Saved enhanced report to {report_file}")
+        return report_text
+    
+    def _write_enhanced_report(self, out, opportunities: Dict):
+        """Write the markdown report to a text stream"""
+        out.write("# Enhanced Cross-Exchange Arbitrage Opportunity Analysis Report\n")
+        out.write(f"**Generated:** {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        out.write(f"**Data Source:** {self.data_folder}\n")
+        out.write(f"**Exchanges Analyzed:** {', '.join(self.exchanges)}\n")
+        out.write(f"**Coins Analyzed:** {', '.join(self.coins)}\n\n")
         
         # Analysis Methodology
-        report.append("## Analysis Methodology")
-        report.append("This enhanced analysis follows a comprehensive 8-step methodology:")
+        out.write("## Analysis Methodology\n"
+                  "This enhanced analysis follows a comprehensive 8-step methodology:\n")
         for step in self.analysis_steps:
-            report.append(f"{step['step']}. **{step['title']}**: {step['description']}")
-        report.append("")
+            out.write(f"{step['step']}. **{step['title']}**: {step['description']}\n")
+        out.write("\n")
         
         # Overall summary
-        if 'overall_summary' in opportunities:
-            summary = opportunities['overall_summary']
-            report.append("## Executive Summary")
-            report.append(f"- **Total Coins Analyzed:** {summary['total_coins_analyzed']}")
-            report.append(f"- **Total Exchanges:** {summary['total_exchanges']}")
-            report.append(f"- **Total Opportunities Found:** {summary['total_opportunities']}")
-            report.append(f"- **Coins with Opportunities:** {summary['coins_with_opportunities']}")
-            report.append(f"- **Minimum Spread Threshold:** {summary['min_spread_threshold']}%")
-            report.append("")
+        summary = opportunities.get('overall_summary')
+        if summary:
+            out.write("## Executive Summary\n")
+            out.write(f"- **Total Coins Analyzed:** {summary['total_coins_analyzed']}\n")
+            out.write(f"- **Total Exchanges:** {summary['total_exchanges']}\n")
+            out.write(f"- **Total Opportunities Found:** {summary['total_opportunities']}\n")
+            out.write(f"- **Coins with Opportunities:** {summary['coins_with_opportunities']}\n")
+            out.write(f"- **Minimum Spread Threshold:** {summary['min_spread_threshold']}%\n\n")
         
         # Data Quality Summary
-        report.append("## Data Quality Assessment")
-        if 'quality_reports' in opportunities.get('overall_summary', {}):
-            quality_reports = opportunities['overall_summary']['quality_reports']
+        out.write("## Data Quality Assessment\n")
+        if summary and 'quality_reports' in summary:
+            quality_reports = summary['quality_reports']
             for coin, report_data in quality_reports.items():
                 if report_data and report_data.get('overall_quality'):
                     quality = report_data['overall_quality']
-                    report.append(f"### {coin}")
-                    report.append(f"- **Data Completeness:** {quality['data_completeness']:.1f}%")
-                    report.append(f"- **Exchange Coverage:** {quality['exchange_coverage']}")
-                    report.append(f"- **Total Records:** {quality['total_records']:,}")
-                    report.append("")
+                    out.write(f"### {coin}\n")
+                    out.write(f"- **Data Completeness:** {quality['data_completeness']:.1f}%\n")
+                    out.write(f"- **Exchange Coverage:** {quality['exchange_coverage']}\n")
+                    out.write(f"- **Total Records:** {quality['total_records']:,}\n\n")
         
         # Detailed analysis by coin
-        report.append("## Detailed Analysis by Coin")
+        out.write("## Detailed Analysis by Coin\n")
         
+        # Min-heap of the 5 best (composite score, -position, opportunity) seen so far, filled in the same pass;
+        # the negated position keeps the earliest opportunity first among equal scores
+        top_heap = []
+        position = 0
         for coin in self.coins:
-            if coin in opportunities and opportunities[coin].get('opportunities'):
-                data = opportunities[coin]
-                report.append(f"### {coin}")
-                report.append(f"- **Total Observations:** {data['total_observations']:,}")
-                report.append(f"- **Exchange Pairs with Opportunities:** {len(data['opportunities'])}")
+            data = opportunities.get(coin)
+            if data and data.get('opportunities'):
+                out.write(f"### {coin}\n")
+                out.write(f"- **Total Observations:** {data['total_observations']:,}\n")
+                out.write(f"- **Exchange Pairs with Opportunities:** {len(data['opportunities'])}\n")
                 
                 if data.get('summary'):
-                    report.append(f"- **Total Opportunities:** {data['summary']['total_opportunities']:,}")
-                    report.append(f"- **Average Spread:** {data['summary']['average_spread']:.4f}%")
-                    report.append(f"- **Maximum Spread:** {data['summary']['maximum_spread']:.4f}%")
-                    report.append(f"- **Overall Opportunity Rate:** {data['summary']['overall_opportunity_rate']:.2f}%")
+                    out.write(f"- **Total Opportunities:** {data['summary']['total_opportunities']:,}\n")
+                    out.write(f"- **Average Spread:** {data['summary']['average_spread']:.4f}%\n")
+                    out.write(f"- **Maximum Spread:** {data['summary']['maximum_spread']:.4f}%\n")
+                    out.write(f"- **Overall Opportunity Rate:** {data['summary']['overall_opportunity_rate']:.2f}%\n")
                 
                 # Risk and profitability analysis
                 if data.get('risk_analysis'):
                     risk = data['risk_analysis']
-                    report.append(f"- **Risk Profile:**")
-                    report.append(f"  - Low Risk: {risk['risk_distribution']['low_risk']}")
-                    report.append(f"  - Medium Risk: {risk['risk_distribution']['medium_risk']}")
-                    report.append(f"  - High Risk: {risk['risk_distribution']['high_risk']}")
+                    out.write("- **Risk Profile:**\n")
+                    out.write(f"  - Low Risk: {risk['risk_distribution']['low_risk']}\n")
+                    out.write(f"  - Medium Risk: {risk['risk_distribution']['medium_risk']}\n")
+                    out.write(f"  - High Risk: {risk['risk_distribution']['high_risk']}\n")
                 
-                report.append("")
+                out.write("\n")
                 
                 # Exchange pair details
                 for opp in data['opportunities']:
-                    report.append(f"#### {opp['exchange_pair']}")
-                    report.append(f"- **Buy Exchange:** {opp['buy_exchange']}")
-                    report.append(f"- **Sell Exchange:** {opp['sell_exchange']}")
-                    report.append(f"- **Opportunities:** {opp['opportunity_count']:,} ({opp['opportunity_percentage']:.2f}%)")
-                    report.append(f"- **Spread Range:** {opp['min_spread']:.4f}% - {opp['max_spread']:.4f}%")
-                    report.append(f"- **Average Spread:** {opp['avg_spread']:.4f}%")
-                    report.append(f"- **Risk Score:** {opp['risk_score']:.1f}/100")
-                    report.append(f"- **Profitability Score:** {opp['profitability_score']:.1f}/100")
-                    report.append(f"- **Total Volume:** {opp['total_volume']:,.2f}")
-                    report.append("")
+                    out.write(format_pair_report(opp))
+                    
+                    entry = (opp['composite_score'], position, opp)
+                    position -= 1
+                    if len(top_heap) < 5:
+                        heapq.heappush(top_heap, entry)
+                    else:
+                        heapq.heappushpop(top_heap, entry)
             else:
-                report.append(f"### {coin}")
-                report.append("- **No arbitrage opportunities found**")
-                report.append("")
+                out.write(f"### {coin}\n"
+                          "- **No arbitrage opportunities found**\n\n")
         
         # Strategic recommendations
-        report.append("## Strategic Recommendations")
-        report.append("")
-        report.append("### High-Priority Opportunities")
-        
-        # Find top opportunities based on composite score
-        all_opps = []
-        for coin, data in opportunities.items():
-            if isinstance(data, dict) and data.get('opportunities'):
-                for opp in data['opportunities']:
-                    opp['coin'] = coin
-                    # Calculate composite score (profitability - risk)
-                    composite_score = opp['profitability_score'] - opp['risk_score']
-                    opp['composite_score'] = composite_score
-                    all_opps.append(opp)
-        
-        if all_opps:
-            # Sort by composite score
-            all_opps.sort(key=lambda x: x['composite_score'], reverse=True)
-            
-            for i, opp in enumerate(all_opps[:5]):
-                report.append(f"{i+1}. **{opp['coin']} - {opp['exchange_pair']}**")
-                report.append(f"   - Composite Score: {opp['composite_score']:.1f}")
-                report.append(f"   - Profitability: {opp['profitability_score']:.1f}/100")
-                report.append(f"   - Risk: {opp['risk_score']:.1f}/100")
-                report.append(f"   - Opportunity Rate: {opp['opportunity_percentage']:.2f}%")
-                report.append(f"   - Average Spread: {opp['avg_spread']:.4f}%")
-                report.append("")
-        
-        report.append("### Implementation Strategy")
-        report.append("1. **Start with high-composite-score pairs** - Focus on profitable, low-risk opportunities")
-        report.append("2. **Exchange prioritization** - Begin with most liquid exchange pairs")
-        report.append("3. **Risk management** - Implement strict risk score thresholds")
-        report.append("4. **Execution optimization** - Develop fast execution algorithms for identified opportunities")
-        report.append("5. **Continuous monitoring** - Set up real-time opportunity detection with risk scoring")
-        report.append("6. **Data quality maintenance** - Regular data quality assessments")
-        
-        # Save report
-        report_text = "\n".join(report)
-        report_file = self.data_folder / "analysis" / "enhanced_arbitrage_analysis_report.md"
-        
-        with open(report_file, 'w') as f:
-            f.write(report_text)
-        
-        print(f"   💾 Saved enhanced report to {report_file}")
-        return report_text
+        out.write("""## Strategic Recommendations
+
+### High-Priority Opportunities
+""")
+        
+        # The whole section is joined from its formatted rows and written once; join is given a list,
+        # since it would copy a generator into one before sizing the result anyway
+        out.write("".join([format_top_report(rank, opp)
+                           for rank, (_, _, opp) in enumerate(sorted(top_heap, reverse=True), 1)]))
+        
+        out.write("""### Implementation Strategy
+1. **Start with high-composite-score pairs** - Focus on profitable, low-risk opportunities
+2. **Exchange prioritization** - Begin with most liquid exchange pairs
+3. **Risk management** - Implement strict risk score thresholds
+4. **Execution optimization** - Develop fast execution algorithms for identified opportunities
+5. **Continuous monitoring** - Set up real-time opportunity detection with risk scoring
+6. **Data quality maintenance** - Regular data quality assessments
+""")
     
     def save_analysis_results(self, opportunities: Dict):
         """Save all analysis results and data"""
@@ -780,42 +1238,62 @@ class EnhancedCrossExchangeArbitrageAnalyzer:
         
         # Save opportunities data
         opportunities_file = self.data_folder / "analysis" / "enhanced_arbitrage_opportunities.json"
-        with open(opportunities_file, 'w') as f:
-            json.dump(opportunities, f, indent=2, default=str)
+        write_json(opportunities, opportunities_file)
         
         # Save analysis steps
         steps_file = self.data_folder / "analysis" / "analysis_steps.json"
-        with open(steps_file, 'w') as f:
-            json.dump(self.analysis_steps, f, indent=2, default=str)
+        write_json(self.analysis_steps, steps_file)
         
         print(f"   💾 Saved opportunities data to {opportunities_file}")
         print(f"   💾 Saved analysis steps to {steps_file}")
 
-def main():
-    """Main execution function"""
-    import argparse
+def _analyze_coin_task(data_folder: str, exchanges: List[str], coin: str, min_spread_pct: float = 0.1):
+    """Run one coin's quality, spread and opportunity analysis in a worker process
     
+    Returns the quality report, the opportunities and the analysis steps recorded on the way.
+    """
+    analyzer = EnhancedCrossExchangeArbitrageAnalyzer(data_folder, setup=False)
+    analyzer.exchanges = exchanges
+    quality_report, opportunities = analyzer.analyze_coin(coin, min_spread_pct)
+    return quality_report, opportunities, analyzer.analysis_steps
+
+@lru_cache(maxsize=None)
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Command line parser, built once per process"""
     parser = argparse.ArgumentParser(description="Enhanced Cross-Exchange Arbitrage Analyzer")
     parser.add_argument('--data-folder', type=str, default='full_data',
                        help='Path to data folder')
     parser.add_argument('--min-spread', type=float, default=0.1,
                        help='Minimum spread percentage for opportunities')
     parser.add_argument('--coin', type=str, help='Analyze specific coin only')
-    
-    args = parser.parse_args()
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Processes for the per-coin analysis (0 = one per CPU)')
+    parser.add_argument('--stream-quality', action='store_true',
+                       help='Only run the data quality analysis, streaming parquet batches instead of loading data')
+    return parser
+
+def main():
+    """Main execution function"""
+    args = build_arg_parser().parse_args()
     
     # Initialize enhanced analyzer
     analyzer = EnhancedCrossExchangeArbitrageAnalyzer(args.data_folder)
     
-    if args.coin:
+    if args.stream_quality:
+        # Data quality only, without materializing any exchange-coin frame
+        coins = [args.coin] if args.coin else analyzer.coins
+        quality_reports = {coin: analyzer.analyze_data_quality(coin, materialize=False) for coin in coins}
+        print("\n📊 Streaming data quality results:")
+        print_json(quality_reports)
+    elif args.coin:
         # Analyze specific coin
         print(f"🎯 Running enhanced analysis for {args.coin}...")
         opportunities = analyzer.identify_arbitrage_opportunities(args.coin, args.min_spread)
         print(f"\n📊 Enhanced analysis results for {args.coin}:")
-        print(json.dumps(opportunities, indent=2, default=str))
+        print_json(opportunities)
     else:
         # Run complete enhanced analysis
-        analyzer.run_complete_enhanced_analysis(args.min_spread)
+        analyzer.run_complete_enhanced_analysis(args.min_spread, workers=args.workers or os.cpu_count())
 
 if __name__ == "__main__":
     main()
@@ -1,47 +1,87 @@
 import argparse
+import os
+from functools import lru_cache
 import duckdb
-import pandas as pd
 
-def run_verification(parquet_path: str):
+# The parquet file is bound as the $path parameter; DuckDB views cannot take parameters, so each query reads it in a CTE
+OHLCV_CTE = "ohlcv AS (SELECT * FROM read_parquet($path))"
+
+# Every scalar check in one statement, so DuckDB plans a single pass over the data instead of one per check
+SUMMARY_QUERY = f"""
+    WITH {OHLCV_CTE},
+    stats AS (
+        SELECT
+            COUNT(*) AS total_records,
+            MIN(timestamp) AS start_time,
+            MAX(timestamp) AS end_time,
+            COUNT(*) FILTER (WHERE open IS NULL OR high IS NULL OR low IS NULL OR close IS NULL OR volume IS NULL) AS null_records,
+            COUNT(*) FILTER (WHERE low > high) AS invalid_ohlc_records,
+            COUNT(*) FILTER (WHERE volume = 0) AS zero_volume_records
+        FROM ohlcv
+    ),
+    gaps AS (
+        SELECT 
+            COUNT(*) AS time_gaps
+        FROM (
+            SELECT 
+                timestamp - LAG(timestamp) OVER (ORDER BY timestamp) AS gap
+            FROM ohlcv
+        ) AS t 
+        WHERE gap > INTERVAL 1 SECOND
+    )
+    SELECT * FROM stats, gaps;
+"""
+
+TOP_VOLUME_QUERY = f"WITH {OHLCV_CTE} SELECT timestamp, volume FROM ohlcv ORDER BY volume DESC LIMIT 5;"
+
+# Summary columns shown under each check
+SUMMARY_CHECKS = {
+    "1. Count Total Records": ['total_records'],
+    "2. Time Range": ['start_time', 'end_time'],
+    "3. Check for NULLs": ['null_records'],
+    "4. Check for Invalid OHLC (Low > High)": ['invalid_ohlc_records'],
+    "5. Check for Zero Volume Bars": ['zero_volume_records'],
+    "6. Time Gaps (assuming 1-second frequency)": ['time_gaps'],
+}
+
+def run_verification(parquet_path: str, threads: int = None, memory_limit: str = None):
     """
     Connects to a Parquet file using DuckDB and runs a series of SQL-based data verification queries.
+
+    DuckDB runs on `threads` threads (default: one per CPU) and, if given, within `memory_limit` (e.g. '8GB').
     """
     print(f"--- Verifying Data Integrity for: {parquet_path} ---")
 
     try:
         # Use DuckDB to directly query the Parquet file
         con = duckdb.connect(database=':memory:', read_only=False)
-        con.execute(f"CREATE OR REPLACE VIEW ohlcv AS SELECT * FROM read_parquet('{parquet_path}');")
-
-        queries = {
-            "1. Count Total Records": "SELECT COUNT(*) FROM ohlcv;",
-            "2. Time Range": "SELECT MIN(timestamp) AS start_time, MAX(timestamp) AS end_time FROM ohlcv;",
-            "3. Check for NULLs": "SELECT COUNT(*) FROM ohlcv WHERE open IS NULL OR high IS NULL OR low IS NULL OR close IS NULL OR volume IS NULL;",
-            "4. Check for Invalid OHLC (Low > High)": "SELECT COUNT(*) FROM ohlcv WHERE low > high;",
-            "5. Check for Zero Volume Bars": "SELECT COUNT(*) FROM ohlcv WHERE volume = 0;",
-            "6. Top 5 Volume Bars": "SELECT timestamp, volume FROM ohlcv ORDER BY volume DESC LIMIT 5;",
-            "7. Time Gaps (assuming 1-second frequency)": """
-                SELECT 
-                    COUNT(*) 
-                FROM (
-                    SELECT 
-                        timestamp, 
-                        LAG(timestamp, 1) OVER (ORDER BY timestamp) AS prev_timestamp,
-                        (EXTRACT(EPOCH FROM timestamp) - EXTRACT(EPOCH FROM LAG(timestamp, 1) OVER (ORDER BY timestamp))) AS diff_seconds
-                    FROM ohlcv
-                ) AS t 
-                WHERE diff_seconds > 1;
-            """
-        }
-
-        for title, query in queries.items():
-            print(f"\n{title}")
-            print("-" * (len(title) + 1))
-            try:
-                result = con.execute(query).fetchdf()
-                print(result)
-            except Exception as e:
-                print(f"Query failed: {e}")
+        # Parquet row groups are scanned in parallel, and the file footer is parsed once for both queries
+        con.execute("SET threads = ?;", [threads or os.cpu_count() or 1])
+        if memory_limit:
+            con.execute("SET memory_limit = ?;", [memory_limit])
+        con.execute("SET parquet_metadata_cache = true;")
+        params = {'path': parquet_path}
+
+        try:
+            # One row of scalars, fetched as a tuple instead of building a DataFrame around it
+            cursor = con.execute(SUMMARY_QUERY, params)
+            summary = dict(zip([column[0] for column in cursor.description], cursor.fetchone()))
+            for title, columns in SUMMARY_CHECKS.items():
+                print(f"\n{title}")
+                print("-" * (len(title) + 1))
+                for column in columns:
+                    print(f"{column}: {summary[column]}")
+        except Exception as e:
+            print(f"Query failed: {e}")
+
+        title = "7. Top 5 Volume Bars"
+        print(f"\n{title}")
+        print("-" * (len(title) + 1))
+        try:
+            for timestamp, volume in con.execute(TOP_VOLUME_QUERY, params).fetchall():
+                print(f"{timestamp}  {volume}")
+        except Exception as e:
+            print(f"Query failed: {e}")
 
     except Exception as e:
         print(f"An error occurred: {e}")
@@ -52,12 +92,21 @@ def run_verification(parquet_path: str):
     print("\n--- Verification Complete ---")
 
 
-def main():
+@lru_cache(maxsize=None)
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Command line parser, built once per process"""
     parser = argparse.ArgumentParser(description="Run SQL-based verification on OHLCV Parquet file.")
     parser.add_argument('parquet_file', type=str, help='Path to the OHLCV Parquet file to verify.')
-    args = parser.parse_args()
+    parser.add_argument('--threads', type=int, default=None, help='DuckDB worker threads (default: one per CPU).')
+    parser.add_argument('--memory-limit', type=str, default=None,
+                        help="DuckDB memory limit such as '8GB' (default: DuckDB's own, 80%% of RAM).")
+    return parser
+
+
+def main():
+    args = build_arg_parser().parse_args()
     
-    run_verification(args.parquet_file)
+    run_verification(args.parquet_file, threads=args.threads, memory_limit=args.memory_limit)
 
 if __name__ == '__main__':
     main()